@@ -3,57 +3,132 @@
 import subprocess
 import re
 import os
+import sys
+
+UNIT_FACTORS = {"B": 1 / 1024, "KiB": 1, "MiB": 1024, "GiB": 1024 * 1024}
+
+# pacman output is ASCII, so parse the raw bytes and only decode the values
+# we keep. A field value may wrap onto space-indented continuation lines.
+_FIELD_RE = re.compile(
+    rb"^(Name|Provides|Depends On|Installed Size)\s*:\s*(.*(?:\n {2,}.*)*)",
+    re.MULTILINE,
+)
+_SIZE_RE = re.compile(rb"([\d.,]+)\s*(B|KiB|MiB|GiB)")
+_VERSION_RE = re.compile(r"[<>=]")
+
+# Function to parse `pacman -Qi` for every installed package in one call
+def load_package_db():
+    """
+    Returns (sizes, depends, provides): installed size in KiB and the direct
+    dependency names per package, plus a map from provided names (e.g. "sh")
+    to the package providing them.
+    """
+    result = subprocess.run(
+        ["pacman", "-Qi"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    sizes, depends, provides = {}, {}, {}
+    for block in result.stdout.split(b"\n\n"):
+        fields = dict(_FIELD_RE.findall(block))
+        name = fields.get(b"Name")
+        if not name:
+            continue
+        name = name.strip().decode()
+
+        size = 0
+        size_match = _SIZE_RE.match(fields.get(b"Installed Size", b""))
+        if size_match:
+            size = (float(size_match.group(1).replace(b",", b"."))
+                    * UNIT_FACTORS[size_match.group(2).decode()])
+        sizes[name] = size
+
+        deps = fields.get(b"Depends On", b"None").split()
+        depends[name] = [] if deps == [b"None"] else [d.decode() for d in deps]
+        prov = fields.get(b"Provides", b"None").split()
+        if prov != [b"None"]:
+            for p in prov:
+                provides.setdefault(strip_version(p.decode()), name)
+    return sizes, depends, provides
+
+def strip_version(dep):
+    """'glibc>=2.38' -> 'glibc'"""
+    return _VERSION_RE.split(dep, maxsplit=1)[0]
+
+def resolve_dep(dep, sizes, provides):
+    """Map a dependency string to the installed package satisfying it."""
+    dep = strip_version(dep)
+    return dep if dep in sizes else provides.get(dep)
+
+# Function to compute every package's transitive dependency set in one pass
+def transitive_deps(sizes, depends, provides):
+    """
+    Map every installed package to a frozenset of itself plus everything it
+    transitively depends on (the set `pactree -u pkg` lists).
+
+    Packages are visited depth-first and grouped into strongly connected
+    components (Tarjan), so dependency cycles are handled and each shared
+    subtree (glibc, gcc-libs, ...) is computed once and reused.
+    """
+    graph = {
+        pkg: {d for d in (resolve_dep(dep, sizes, provides) for dep in deps) if d}
+        for pkg, deps in depends.items()
+    }
+    index, low = {}, {}
+    stack, on_stack = [], set()
+    closure = {}
+
+    def visit(v):
+        index[v] = low[v] = len(index)
+        stack.append(v)
+        on_stack.add(v)
+        for w in graph[v]:
+            if w not in index:
+                visit(w)
+                low[v] = min(low[v], low[w])
+            elif w in on_stack:
+                low[v] = min(low[v], index[w])
+        if low[v] == index[v]:
+            scc = []
+            while True:
+                w = stack.pop()
+                on_stack.discard(w)
+                scc.append(w)
+                if w == v:
+                    break
+            members = frozenset(scc)
+            # every dependency outside this component is already finished
+            deps = members.union(*(closure[w] for u in scc for w in graph[u]
+                                   if w not in members))
+            for u in scc:
+                closure[u] = deps
+
+    # the DFS can be as deep as the longest dependency chain
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), len(graph) + 100))
+    for v in graph:
+        if v not in index:
+            visit(v)
+    return closure
 
 # Function to get the size of a package and its dependencies
-def get_package_size(pkg):
-    try:
-        # Get list of packages that would be removed with the target package
-        result = subprocess.run(
-            ["pactree", "-u", pkg],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        if result.returncode != 0:
-            return None
-
-        # Extract the package names
-        packages = result.stdout.strip().splitlines()
-
-        # Get the size of each package
-        total_size = 0
-        for package in packages:
-            size_result = subprocess.run(
-                ["pacman", "-Qi", package],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-            )
-            if size_result.returncode == 0:
-                size_info = size_result.stdout
-                size_match = re.search(r"Installed Size\s+:\s+(\d+\.?\d*)\s(\w+)", size_info)
-                if size_match:
-                    size, unit = float(size_match.group(1)), size_match.group(2)
-                    if unit == "KiB":
-                        size *= 1
-                    elif unit == "MiB":
-                        size *= 1024
-                    elif unit == "GiB":
-                        size *= 1024 * 1024
-                    total_size += size
-        return total_size
-    except Exception as e:
-        print(f"Error calculating size for {pkg}: {e}")
+def get_package_size(pkg, sizes, closure):
+    """
+    Sum the installed size of pkg and everything it transitively depends on.
+    """
+    if pkg not in closure:
         return None
+    return sum(sizes[p] for p in closure[pkg])
 
 # Get a list of all explicitly installed packages
 result = subprocess.run(["pacman", "-Qqe"], stdout=subprocess.PIPE, text=True)
 packages = result.stdout.strip().splitlines()
 
 # Calculate size for each package
+sizes, depends, provides = load_package_db()
+closure = transitive_deps(sizes, depends, provides)
 package_sizes = []
 for pkg in packages:
-    size = get_package_size(pkg)
+    size = get_package_size(pkg, sizes, closure)
     if size is not None:
         package_sizes.append((pkg, size))
 
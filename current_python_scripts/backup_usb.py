@@ -18,49 +18,338 @@ Arguments:
 
 Example:
     python3 backup_usb.py /media/usb0 --format zip
+
+Files are archived ordered by extension, then path, so the archive order is
+stable between runs and similar files sit next to each other, which lets
+gzip's 32 KiB window find more matches.
 """
 
 import os
 import sys
+import copy
+import fcntl
+import shutil
 import argparse
+import subprocess
 import tarfile
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, suppress
 from pathlib import Path
 from rich.progress import Progress
 
+# Optional ISA-L bindings: SIMD-accelerated DEFLATE, several times faster
+# than zlib at comparable ratios. Used when pigz is not installed (tar.gz)
+# and for the zip workers.
+try:
+    from isal import igzip, isal_zlib
+    _ISAL = True
+except ModuleNotFoundError:
+    _ISAL = False
+
+_deflate = isal_zlib if _ISAL else zlib
+
+# Copy buffer for file data going into the archive. tarfile and zipfile
+# default to 16 KiB / 8 KiB, which makes large-file throughput syscall-bound.
+COPY_BUFSIZE = 1 << 20
+
+# Zip entries up to this size are deflated in worker processes and held in
+# memory until written; larger files are streamed in the main process.
+PARALLEL_MAX_FILE_SIZE = 64 << 20
+
+# Already-compressed formats gain nothing from DEFLATE; store them as-is in zips.
+INCOMPRESSIBLE = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".mp3", ".flac", ".ogg", ".opus", ".m4a", ".aac",
+    ".mp4", ".mkv", ".mov", ".avi", ".webm",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z", ".rar",
+    ".pdf", ".docx", ".xlsx", ".pptx", ".odt", ".epub", ".jar", ".apk",
+}
+
+# The archive is written sequentially, so buffer it in large blocks to keep
+# the number of write() calls down on slow USB/network targets.
+WRITE_BUFSIZE = 4 << 20
+
+@contextmanager
+def _open_archive(output_path):
+    """
+    Open output_path for writing with a WRITE_BUFSIZE buffer.
+    The data is flushed and fsync'ed to disk when the block exits cleanly.
+    """
+    with open(output_path, "wb", buffering=WRITE_BUFSIZE) as out:
+        yield out
+        out.flush()
+        os.fsync(out.fileno())
+
+def _iter_files(root):
+    """
+    Yield os.DirEntry objects for every non-directory entry under root.
+    Symlinked directories are skipped entirely (neither yielded nor
+    descended into), as are unreadable directories.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                yield entry
+            elif not entry.is_symlink():
+                yield from _iter_files(entry.path)
+
 def gather_files(source_dir):
     """
     Recursively collect all file paths under source_dir.
     Returns a list of absolute file paths.
     """
-    file_list = []
-    for root, _, files in os.walk(source_dir):
-        for name in files:
-            file_list.append(os.path.join(root, name))
-    return file_list
+    return [entry.path for entry in _iter_files(source_dir)]
+
+class _PipeWriter:
+    """
+    Minimal file object over a pipe that tracks its own position, so
+    tarfile's regular (non-stream) mode, which calls tell(), can write to it.
+    """
+    def __init__(self, pipe):
+        self.pipe = pipe
+        self.pos = 0
+
+    def write(self, data):
+        self.pipe.write(data)
+        self.pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.pos
+
+    def flush(self):
+        self.pipe.flush()
+
+    def fileno(self):
+        return self.pipe.fileno()
+
+class _SendfileTarFile(tarfile.TarFile):
+    """
+    TarFile writing to a _PipeWriter that moves regular-file data into the
+    pipe with os.sendfile, so file contents never pass through Python.
+    Other member types (and files sendfile refuses) use the normal copy.
+    """
+    def addfile(self, tarinfo, fileobj=None):
+        if fileobj is None or not tarinfo.isreg():
+            return super().addfile(tarinfo, fileobj)
+
+        self._check("awx")
+        tarinfo = copy.copy(tarinfo)
+        buf = tarinfo.tobuf(self.format, self.encoding, self.errors)
+        self.fileobj.write(buf)
+        self.offset += len(buf)
+        self.fileobj.flush()
+
+        out_fd, in_fd = self.fileobj.fileno(), fileobj.fileno()
+        remaining = tarinfo.size
+        while remaining:
+            try:
+                sent = os.sendfile(out_fd, in_fd, None, min(remaining, 1 << 30))
+            except OSError:
+                if remaining != tarinfo.size:
+                    raise
+                # e.g. a filesystem without sendfile support
+                tarfile.copyfileobj(fileobj, self.fileobj, remaining,
+                                    bufsize=self.copybufsize)
+                break
+            if sent == 0:
+                raise OSError("unexpected end of data")
+            remaining -= sent
+            self.fileobj.pos += sent
+
+        blocks, remainder = divmod(tarinfo.size, tarfile.BLOCKSIZE)
+        if remainder > 0:
+            self.fileobj.write(tarfile.NUL * (tarfile.BLOCKSIZE - remainder))
+            blocks += 1
+        self.offset += blocks * tarfile.BLOCKSIZE
+        self.members.append(tarinfo)
+
+def _add_files_to_tar(tar, files, source_dir, progress, task_id):
+    for fpath in files:
+        # store paths relative to the source_dir so the archive has a clean tree
+        arcname = os.path.relpath(fpath, start=source_dir)
+        tar.add(fpath, arcname=arcname)
+        progress.update(task_id, advance=1)
 
 def compress_to_tar_gz(files, source_dir, output_path, progress, task_id):
     """
     Create a .tar.gz archive at output_path, adding each file one by one,
     and advancing the Rich progress bar per file.
+
+    If pigz is available, an uncompressed tar stream is piped into it so
+    gzip compression runs on all cores (like `tar -I pigz`), with file data
+    sent into the pipe by the kernel. Otherwise compresses in-process with
+    ISA-L's igzip if installed, or tarfile's built-in gzip as a last resort.
     """
-    with tarfile.open(output_path, mode="w:gz") as tar:
-        for fpath in files:
-            # store paths relative to the source_dir so the archive has a clean tree
-            arcname = os.path.relpath(fpath, start=source_dir)
-            tar.add(fpath, arcname=arcname)
-            progress.update(task_id, advance=1)
+    pigz = shutil.which("pigz")
+    if pigz is None:
+        with _open_archive(output_path) as out:
+            if _ISAL:
+                with igzip.open(out, "wb") as gz, \
+                        tarfile.open(fileobj=gz, mode="w", copybufsize=COPY_BUFSIZE) as tar:
+                    _add_files_to_tar(tar, files, source_dir, progress, task_id)
+            else:
+                with tarfile.open(fileobj=out, mode="w:gz", copybufsize=COPY_BUFSIZE) as tar:
+                    _add_files_to_tar(tar, files, source_dir, progress, task_id)
+        return
+
+    with _open_archive(output_path) as out:
+        proc = subprocess.Popen(
+            [pigz, "-c", "-p", str(os.cpu_count() or 1)],
+            stdin=subprocess.PIPE, stdout=out, bufsize=COPY_BUFSIZE
+        )
+        try:
+            # a bigger pipe lets each sendfile call move more than 64 KiB
+            fcntl.fcntl(proc.stdin.fileno(), fcntl.F_SETPIPE_SZ, COPY_BUFSIZE)
+        except OSError:
+            pass
+        pipe_error = None
+        try:
+            with _SendfileTarFile(fileobj=_PipeWriter(proc.stdin), mode="w",
+                                  copybufsize=COPY_BUFSIZE) as tar:
+                _add_files_to_tar(tar, files, source_dir, progress, task_id)
+        except BrokenPipeError as e:
+            pipe_error = e  # pigz went away; its exit status says why
+        finally:
+            # Flushing into a dead pigz fails again; always reap the process
+            with suppress(BrokenPipeError):
+                proc.stdin.close()
+            rc = proc.wait()
+        if rc != 0:
+            raise RuntimeError(f"pigz exited with status {rc}") from pipe_error
+        if pipe_error is not None:
+            raise pipe_error
+
+def _deflate_chunks(src, emit):
+    """
+    Read src once, feeding every chunk to both the CRC-32 and the raw
+    DEFLATE compressor (as stored in a zip entry) and passing compressed
+    output to emit. Returns (crc32, uncompressed_size).
+    """
+    crc = 0
+    size = 0
+    co = _deflate.compressobj(_deflate.Z_DEFAULT_COMPRESSION, _deflate.DEFLATED,
+                              -_deflate.MAX_WBITS)
+    while chunk := src.read(COPY_BUFSIZE):
+        crc = _deflate.crc32(chunk, crc)
+        size += len(chunk)
+        emit(co.compress(chunk))
+    emit(co.flush())
+    return crc, size
+
+def _deflate_file(fpath):
+    """
+    Worker: raw-DEFLATE one file (as stored in a zip entry).
+    Returns (compressed_bytes, crc32, uncompressed_size).
+    """
+    chunks = []
+    with open(fpath, "rb") as src:
+        crc, size = _deflate_chunks(src, chunks.append)
+    return b"".join(chunks), crc, size
+
+def _start_entry(zf, zinfo, zip64):
+    """Write zinfo's local header at the current end of the archive."""
+    zf._writecheck(zinfo)
+    zf._didModify = True
+    zinfo.header_offset = zf.fp.tell()
+    zf.fp.write(zinfo.FileHeader(zip64))
+
+def _finish_entry(zf, zinfo):
+    """Register a fully written entry for the central directory."""
+    zf.filelist.append(zinfo)
+    zf.NameToInfo[zinfo.filename] = zinfo
+    zf.start_dir = zf.fp.tell()
+
+def _write_precompressed(zf, zinfo, payload):
+    """
+    Append an entry whose data is already compressed, bypassing ZipFile's
+    own compressor. zinfo must carry CRC and file_size.
+    """
+    zinfo.compress_size = len(payload)
+    _start_entry(zf, zinfo, max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT)
+    zf.fp.write(payload)
+    _finish_entry(zf, zinfo)
+
+def _write_deflated_stream(zf, zinfo, fpath):
+    """
+    Deflate a file too large to hold in memory straight into the archive in
+    a single read pass, then patch the local header with the final CRC and
+    sizes (the archive file is seekable).
+    """
+    zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+    zinfo.CRC = zinfo.compress_size = 0  # placeholders until the data is written
+    _start_entry(zf, zinfo, zip64)
+    data_start = zf.fp.tell()
+    with open(fpath, "rb") as src:
+        zinfo.CRC, zinfo.file_size = _deflate_chunks(src, zf.fp.write)
+    data_end = zf.fp.tell()
+    zinfo.compress_size = data_end - data_start
+    if not zip64 and max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT:
+        raise RuntimeError(f"{fpath} grew past 4 GiB while being archived")
+    zf.fp.seek(zinfo.header_offset)
+    zf.fp.write(zinfo.FileHeader(zip64))
+    zf.fp.seek(data_end)
+    _finish_entry(zf, zinfo)
+
+def _store_to_zip(zf, zinfo, fpath):
+    with open(fpath, "rb") as src, zf.open(zinfo, "w") as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFSIZE)
 
 def compress_to_zip(files, source_dir, output_path, progress, task_id):
     """
     Create a .zip archive at output_path, adding each file one by one,
     and advancing the Rich progress bar per file.
+
+    Files are deflated in a process pool while the main process writes
+    finished entries in submission order, so the archive is deterministic.
+    At most 2 x CPU results are in flight at once to bound memory use.
+    Files with an INCOMPRESSIBLE extension are stored without compression.
     """
-    with zipfile.ZipFile(output_path, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+    workers = os.cpu_count() or 1
+    pending = deque()
+
+    def write_next(zf):
+        zinfo, fpath, future = pending.popleft()
+        if future is not None:
+            payload, zinfo.CRC, zinfo.file_size = future.result()
+            _write_precompressed(zf, zinfo, payload)
+        elif zinfo.compress_type == zipfile.ZIP_STORED:
+            _store_to_zip(zf, zinfo, fpath)
+        else:
+            _write_deflated_stream(zf, zinfo, fpath)
+        progress.update(task_id, advance=1)
+
+    with _open_archive(output_path) as out, \
+            zipfile.ZipFile(out, mode="w", compression=zipfile.ZIP_DEFLATED) as zf, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
         for fpath in files:
             arcname = os.path.relpath(fpath, start=source_dir)
-            zf.write(fpath, arcname=arcname)
-            progress.update(task_id, advance=1)
+            zinfo = zipfile.ZipInfo.from_file(fpath, arcname=arcname)
+            if os.path.splitext(fpath)[1].lower() in INCOMPRESSIBLE:
+                zinfo.compress_type = zipfile.ZIP_STORED
+            else:
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+            if (zinfo.compress_type == zipfile.ZIP_STORED
+                    or zinfo.file_size > PARALLEL_MAX_FILE_SIZE):
+                future = None
+            else:
+                future = pool.submit(_deflate_file, fpath)
+            pending.append((zinfo, fpath, future))
+            if len(pending) >= 2 * workers:
+                write_next(zf)
+        while pending:
+            write_next(zf)
 
 def parse_args():
     parser = argparse.ArgumentParser(
@@ -100,6 +389,7 @@ def main():
     args = parse_args()
     src = str(args.source_dir.resolve())
     files = gather_files(src)
+    files.sort(key=lambda p: (os.path.splitext(p)[1], p))
     total = len(files)
 
     if total == 0:
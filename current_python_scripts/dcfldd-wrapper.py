@@ -38,7 +38,7 @@
 #
 # REQUIREMENTS
 # ------------
-#   • bash ≥ 4.2   • dcfldd   • lsblk   • blockdev   • bc   • awk
+#   • bash ≥ 4.2   • dcfldd   • lsblk   • blockdev
 #   • python3 + rich (`pip install rich`)
 #   • Optional: bat, numfmt (part of coreutils ≥ 8.24)
 ################################################################################
@@ -109,7 +109,7 @@ err()  { echo -e "[\e[31mERROR\e[0m] $*" >&2; exit 1; }
 # DEPENDENCY CHECK
 ################################################################################
 need() { command -v "$1" &>/dev/null || err "Required binary '$1' not found"; }
-for bin in dcfldd lsblk blockdev bc awk python3; do need "$bin"; done
+for bin in dcfldd lsblk blockdev python3; do need "$bin"; done
 python3 - <<'PY' || err "Python package 'rich' missing — install with: pip install rich"
 import importlib, sys; sys.exit(0 if importlib.util.find_spec("rich") else 1)
 PY
@@ -169,7 +169,7 @@ if [[ -n $COUNT ]]; then
   BLOCK_COUNT=$COUNT
   SIZE_BYTES=$(( BLOCK_COUNT * BLOCKSIZE_BYTES ))
 else
-  BLOCK_COUNT=$(bc <<< "scale=0; ($SIZE_BYTES + $BLOCKSIZE_BYTES - 1) / $BLOCKSIZE_BYTES")
+  BLOCK_COUNT=$(( (SIZE_BYTES + BLOCKSIZE_BYTES - 1) / BLOCKSIZE_BYTES ))
 fi
 
 log "Input type       : $DEVTYPE"
@@ -227,15 +227,29 @@ args = parser.parse_args()
 
 console = Console()
 progress = Progress("{task.description}", BarColumn(bar_width=None), "[progress.percentage]{task.percentage:>6.2f}%", TransferSpeedColumn(), TimeRemainingColumn(), console=console, transient=True)
-bytes_re = re.compile(r"(\d+) bytes")
+bytes_re = re.compile(rb"(\d+) bytes")
 
 with progress:
     task = progress.add_task("Copying", total=args.total)
-    proc = subprocess.Popen(args.cmd, stderr=subprocess.PIPE, text=True)
-    for line in proc.stderr:
-        m = bytes_re.search(line)
+    proc = subprocess.Popen(args.cmd, stderr=subprocess.PIPE)
+    # Read stderr in 64 KiB chunks, scan the complete status lines in each and
+    # carry the unterminated tail over; only the newest count matters.
+    # Redraw at most every 0.1 s unless another ~1% has been copied
+    last_ts, last_bytes = time.monotonic(), 0
+    tail = b""
+    while chunk := proc.stderr.read1(65536):
+        buf = tail + chunk
+        cut = max(buf.rfind(b"\n"), buf.rfind(b"\r")) + 1
+        buf, tail = buf[:cut], buf[cut:]
+        m = None
+        for m in bytes_re.finditer(buf):
+            pass
         if m:
-            progress.update(task, completed=int(m.group(1)))
+            done = int(m.group(1))
+            now = time.monotonic()
+            if now - last_ts > 0.1 or done - last_bytes > args.total / 100:
+                progress.update(task, completed=done)
+                last_ts, last_bytes = now, done
     proc.wait()
     progress.update(task, completed=args.total)
 
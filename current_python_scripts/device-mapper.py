@@ -24,8 +24,7 @@ import subprocess
 import json
 import shutil
 import os                                    # ← New: for ismount()
-from rich.table import Table
-from rich.console import Console
+from functools import lru_cache
 
 
 def get_lsblk_data():
@@ -43,21 +42,44 @@ def get_lsblk_data():
     return data.get("blockdevices", [])
 
 
-def get_uuid(device_name):
+@lru_cache(maxsize=None)
+def get_blkid_uuids():
     """
-    Retrieve the UUID of a given device via blkid.
-    Returns an empty string on failure.
+    Run blkid once and map every device path it reports to its UUID.
+    Returns an empty dict on failure.
     """
     try:
-        uuid = subprocess.check_output([
-            "blkid",
-            "-s", "UUID",
-            "-o", "value",
-            f"/dev/{device_name}"
-        ], text=True).strip()
-        return uuid
-    except subprocess.CalledProcessError:
-        return ""
+        output = subprocess.check_output(["blkid", "-o", "export"], text=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return {}
+    uuids = {}
+    for block in output.split("\n\n"):
+        fields = dict(line.partition("=")[::2] for line in block.splitlines())
+        if "DEVNAME" in fields and "UUID" in fields:
+            uuids[fields["DEVNAME"]] = fields["UUID"]
+    return uuids
+
+
+def get_uuid(device_name):
+    """
+    Retrieve the UUID of a given device from the bulk blkid listing.
+    Returns an empty string if blkid does not know the device.
+    """
+    return get_blkid_uuids().get(f"/dev/{device_name}", "")
+
+
+@lru_cache(maxsize=None)
+def mount_usage(mount):
+    """
+    Return shutil.disk_usage() for a real mount point, or None if the path is
+    not a mount (e.g. "[SWAP]"). Cached so each mount point is probed once.
+    """
+    if not os.path.ismount(mount):
+        return None
+    return shutil.disk_usage(mount)
+
+
+SIZE_UNITS = ["B", "K", "M", "G", "T", "P", "E"]
 
 
 def format_size(num_bytes):
@@ -65,18 +87,18 @@ def format_size(num_bytes):
     Convert a size in bytes to a human-readable string using binary prefixes.
     E.g., 123456789 -> '117.7M'
     """
-    for unit in ["B", "K", "M", "G", "T", "P"]:
-        if num_bytes < 1024:
-            return f"{num_bytes:.1f}{unit}"
-        num_bytes /= 1024
-    return f"{num_bytes:.1f}E"
+    # Each unit is 10 more bits, so the unit index comes straight from bit_length
+    i = min(6, (int(num_bytes).bit_length() - 1) // 10) if num_bytes >= 1 else 0
+    return f"{num_bytes / (1 << (10 * i)):.1f}{SIZE_UNITS[i]}"
 
 
 def build_table(devices, console):
     """
     Populate and return a Rich Table from the devices list.
-    Recursively handles children partitions.
+    Children partitions are listed directly below their parent device.
     """
+    from rich.table import Table
+
     table = Table(show_header=True, header_style="bold cyan")
     table.add_column("DEVICE", style="dim", no_wrap=True)
     table.add_column("FSTYPE")
@@ -86,44 +108,44 @@ def build_table(devices, console):
     table.add_column("AVAILABLE", justify="right")
     table.add_column("MOUNTPOINT", style="italic")
 
-    def add_rows(dev_list):
-        for d in dev_list:
-            name     = d.get("name", "")
-            fstype   = d.get("fstype") or ""
-            uuid     = d.get("uuid") or get_uuid(name)
-            size     = format_size(int(d.get("size", 0)))
-            mount    = d.get("mountpoint") or ""
-
-            # ----------------------------------------------------------------------------
-            # Compute usage only for real, existing mount points.
-            # os.path.ismount() returns False for "[SWAP]" or any non-mount.
-            if mount and os.path.ismount(mount):
-                try:
-                    usage = shutil.disk_usage(mount)
-                    used  = format_size(usage.used)
-                    avail = format_size(usage.free)
-                except (FileNotFoundError, PermissionError):
-                    # In case the path becomes unavailable or is restricted.
-                    used = avail = ""
-            else:
-                used = avail = ""
-            # ----------------------------------------------------------------------------
-
-            table.add_row(
-                f"/dev/{name}",
-                fstype,
-                uuid,
-                size,
-                used,
-                avail,
-                mount
-            )
-
-            # Recurse into children (partitions), if any
-            if d.get("children"):
-                add_rows(d["children"])
-
-    add_rows(devices)
+    # Depth-first walk with an explicit stack (reversed so rows keep lsblk order)
+    stack = list(reversed(devices))
+    while stack:
+        d = stack.pop()
+        name     = d.get("name", "")
+        fstype   = d.get("fstype") or ""
+        uuid     = d.get("uuid") or get_uuid(name)
+        size     = format_size(int(d.get("size", 0)))
+        mount    = d.get("mountpoint") or ""
+
+        # ----------------------------------------------------------------------------
+        # Compute usage only for real, existing mount points.
+        # os.path.ismount() returns False for "[SWAP]" or any non-mount.
+        try:
+            usage = mount_usage(mount) if mount else None
+        except (FileNotFoundError, PermissionError):
+            # In case the path becomes unavailable or is restricted.
+            usage = None
+        if usage:
+            used  = format_size(usage.used)
+            avail = format_size(usage.free)
+        else:
+            used = avail = ""
+        # ----------------------------------------------------------------------------
+
+        table.add_row(
+            f"/dev/{name}",
+            fstype,
+            uuid,
+            size,
+            used,
+            avail,
+            mount
+        )
+
+        # Queue children (partitions), if any, ahead of the next sibling
+        stack.extend(reversed(d.get("children") or ()))
+
     return table
 
 
@@ -143,6 +165,8 @@ def main():
         print(json.dumps(devices, indent=2))
         return
 
+    from rich.console import Console  # not needed for --json
+
     console = Console()
     table   = build_table(devices, console)
     console.print(table)
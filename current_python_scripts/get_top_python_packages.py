@@ -6,7 +6,8 @@ Fetch the top-N most-downloaded Python packages (past month) from the
 “A monthly dump of the 15 000 most-downloaded packages” JSON maintained at
 https://hugovk.github.io/top-pypi-packages/top-pypi-packages-30-days.min.json
 then:
-  1. Determine which packages are available on conda-forge via `micromamba search`.
+  1. Determine which packages are available on conda-forge from the channel's
+     channeldata.json (falling back to one `micromamba search` per package).
   2. Print two install commands:
      * `micromamba install -c conda-forge <conda_pkg1> <conda_pkg2> …`
      * `pip install <pip_pkgA> <pip_pkgB> …`
@@ -19,18 +20,78 @@ Options:
 """
 
 import argparse
+import io
+import itertools
+import json
 import subprocess
 import sys
-from typing import List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set
 
 import requests
 
+# Optional requests-cache: keeps the top-packages JSON on disk between runs
+try:
+    import requests_cache
+    _REQUESTS_CACHE = True
+except ModuleNotFoundError:
+    _REQUESTS_CACHE = False
+
+# Optional ijson: stream the feed and stop after the first N rows
+try:
+    import ijson
+    _IJSON = True
+except ModuleNotFoundError:
+    _IJSON = False
+
 # URL of the monthly minified JSON (last ~30 days)
 TOP_PYPI_URL = (
     "https://hugovk.github.io/top-pypi-packages/"
     "top-pypi-packages-30-days.min.json"
 )
 
+# On-disk HTTP cache for the top-packages feed (it is regenerated monthly)
+HTTP_CACHE = Path.home() / ".cache" / "top_pypi"
+HTTP_STALE = 24 * 3600  # seconds before a cached copy is revalidated
+# Without requests-cache: last body plus its ETag, for a manual conditional GET
+TOP_BODY = Path.home() / ".cache" / "top_pypi.json"
+TOP_ETAG = Path.home() / ".cache" / "top_pypi.etag"
+
+# conda-forge package index: channeldata.json names every package on every
+# platform in one file; the extracted names are kept on disk for a day
+CONDA_FORGE_CHANNELDATA = "https://conda.anaconda.org/conda-forge/channeldata.json"
+CONDA_NAMES_CACHE = Path.home() / ".cache" / "top_pypi_conda_names.json"
+CONDA_NAMES_STALE = 24 * 3600  # seconds
+
+# Per-package availability results, {package: [checked_at, on_conda]}
+CONDA_CACHE = Path.home() / ".cache" / "top_pypi_conda.json"
+CONDA_STALE = 24 * 3600  # seconds before a package is checked again
+
+
+def load_conda_cache() -> Dict[str, list]:
+    """
+    Return the cached availability entries that are younger than CONDA_STALE.
+    """
+    try:
+        entries = json.loads(CONDA_CACHE.read_text())
+    except (OSError, ValueError):
+        return {}
+    now = time.time()
+    return {pkg: entry for pkg, entry in entries.items() if now - entry[0] < CONDA_STALE}
+
+
+def save_conda_cache(entries: Dict[str, list]) -> None:
+    """
+    Persist the availability entries; a failed write only costs the cache.
+    """
+    try:
+        CONDA_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        CONDA_CACHE.write_text(json.dumps(entries))
+    except OSError:
+        pass
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -46,6 +107,44 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def download_top_packages() -> bytes:
+    """
+    Return the raw top-packages JSON, revalidating any copy kept on disk.
+    """
+    if _REQUESTS_CACHE:
+        # Served from SQLite within HTTP_STALE; after that a conditional
+        # GET (ETag / Last-Modified) usually comes back as a cheap 304.
+        with requests_cache.CachedSession(
+                HTTP_CACHE, backend="sqlite", expire_after=HTTP_STALE) as session:
+            resp = session.get(TOP_PYPI_URL, timeout=10)
+            resp.raise_for_status()
+            return resp.content
+
+    # Same idea by hand: send the stored ETag and reuse the stored body on 304
+    headers = {}
+    try:
+        if TOP_BODY.exists():
+            headers["If-None-Match"] = TOP_ETAG.read_text().strip()
+    except OSError:
+        pass
+    resp = requests.get(TOP_PYPI_URL, headers=headers, timeout=10)
+    if resp.status_code == 304:
+        try:
+            return TOP_BODY.read_bytes()
+        except OSError:
+            resp = requests.get(TOP_PYPI_URL, timeout=10)
+    resp.raise_for_status()
+    etag = resp.headers.get("ETag")
+    if etag:
+        try:
+            TOP_BODY.parent.mkdir(parents=True, exist_ok=True)
+            TOP_BODY.write_bytes(resp.content)
+            TOP_ETAG.write_text(etag)
+        except OSError:
+            pass
+    return resp.content
+
+
 def fetch_top_packages(n: int) -> List[str]:
     """
     Retrieve the top-N package names from the JSON feed.
@@ -53,13 +152,19 @@ def fetch_top_packages(n: int) -> List[str]:
     each containing at least "project" and "download_count".
     """
     try:
-        resp = requests.get(TOP_PYPI_URL, timeout=10)
-        resp.raise_for_status()
+        body = download_top_packages()
     except requests.RequestException as e:
         sys.exit(f"❌ Failed to fetch top-packages JSON: {e}")
 
-    data = resp.json()
-    rows = data.get("rows", data if isinstance(data, list) else [])
+    if _IJSON:
+        # The feed lists ~15 000 rows; parse only as many as needed.
+        # A bare top-level list of rows is accepted as well.
+        prefix = "item" if body.lstrip()[:1] == b"[" else "rows.item"
+        rows = list(itertools.islice(ijson.items(io.BytesIO(body), prefix), n))
+    else:
+        data = json.loads(body)
+        rows = data if isinstance(data, list) else data.get("rows", [])
+
     if not rows:
         sys.exit("❌ JSON structure unexpected: no 'rows' or list found.")
 
@@ -75,20 +180,54 @@ def fetch_top_packages(n: int) -> List[str]:
     return pkgs
 
 
-def is_on_conda(pkg: str) -> bool:
+def load_conda_forge_index() -> Optional[Set[str]]:
+    """
+    Return the set of all conda-forge package names (lower-cased), from the
+    on-disk copy if it is fresh, else from channeldata.json; None if the index
+    could not be fetched.
+    """
+    try:
+        if time.time() - CONDA_NAMES_CACHE.stat().st_mtime < CONDA_NAMES_STALE:
+            return set(json.loads(CONDA_NAMES_CACHE.read_text()))
+    except (OSError, ValueError):
+        pass
+    try:
+        resp = requests.get(CONDA_FORGE_CHANNELDATA, timeout=60)
+        resp.raise_for_status()
+        names = {name.lower() for name in resp.json()["packages"]}
+    except (requests.RequestException, ValueError, KeyError):
+        return None
+    try:
+        CONDA_NAMES_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        CONDA_NAMES_CACHE.write_text(json.dumps(sorted(names)))
+    except OSError:
+        pass
+    return names
+
+
+def is_on_conda(pkg: str, conda_names: Set[str]) -> bool:
+    """
+    Return True if `pkg` is a conda-forge package name.
+    """
+    return pkg.lower() in conda_names
+
+
+def micromamba_has(pkg: str) -> bool:
     """
     Return True if `micromamba search <pkg> -c conda-forge` returns any hits.
+    Only used when the channeldata index is unavailable.
     """
     try:
         proc = subprocess.run(
-            ["micromamba", "search", pkg, "-c", "conda-forge"],
+            ["micromamba", "search", "--json", pkg, "-c", "conda-forge"],
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
             check=True,
-            text=True,
         )
-        return pkg.lower() in proc.stdout.lower()
-    except subprocess.CalledProcessError:
+        # Structured result: look at the hit list instead of lower-casing and
+        # scanning the whole human-readable table
+        return bool(json.loads(proc.stdout).get("result", {}).get("pkgs"))
+    except (subprocess.CalledProcessError, ValueError):
         return False
 
 
@@ -99,8 +238,25 @@ def main():
 
     conda_pkgs, pip_pkgs = [], []
     print("🔄 Checking availability on conda-forge…")
-    for pkg in packages:
-        if is_on_conda(pkg):
+    # Only packages without a fresh cached answer need the index or a probe
+    cache = load_conda_cache()
+    todo = [pkg for pkg in dict.fromkeys(packages) if pkg not in cache]
+    if todo:
+        conda_names = load_conda_forge_index()
+        if conda_names is not None:
+            found = [is_on_conda(pkg, conda_names) for pkg in todo]
+        else:
+            print("⚠ Could not download the conda-forge index; probing with micromamba…")
+            # Each probe is a separate micromamba process waiting on the network, so
+            # run them concurrently; map() keeps the results in ranking order.
+            with ThreadPoolExecutor(max_workers=min(32, len(todo))) as ex:
+                found = list(ex.map(micromamba_has, todo))
+        now = time.time()
+        cache.update({pkg: [now, hit] for pkg, hit in zip(todo, found)})
+        save_conda_cache(cache)
+    available = [cache[pkg][1] for pkg in packages]
+    for pkg, on_conda in zip(packages, available):
+        if on_conda:
             conda_pkgs.append(pkg)
             print(f"  ✔ {pkg}")
         else:
@@ -7,49 +7,56 @@ Usage:
     python html_to_pdf_merge.py -i <input_directory> -o <output_file>
 
 Description:
-    This script converts all HTML files in the specified input directory into individual PDF
-    files, each suffixed with an index (e.g., `page_1.pdf`, `page_2.pdf`, ...), and then
-    merges them into a single consolidated PDF.
+    This script converts all HTML files in the specified input directory into PDFs in
+    memory and merges them into a single consolidated PDF. With --keep-individual the
+    per-file PDFs are also saved, each suffixed with an index (e.g., `page_1.pdf`,
+    `page_2.pdf`, ...).
 
 Requirements:
     - Python 3.7 or higher
     - WeasyPrint (for HTML to PDF conversion)
-    - PyPDF2 (for PDF merging)
+    - pypdf (for PDF merging)
 
 Install dependencies:
-    pip install weasyprint PyPDF2
+    pip install weasyprint pypdf
 
 """
 
+import io
 import os
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from weasyprint import HTML
-from PyPDF2 import PdfMerger
+from pypdf import PdfWriter
 
-def convert_html_to_pdf(html_path: str, pdf_path: str) -> None:
+def convert_html_to_pdf(html_path: str) -> bytes:
     """
-    Convert a single HTML file to a PDF file.
+    Convert a single HTML file to PDF in memory.
 
     Args:
         html_path: Path to the source HTML file.
-        pdf_path: Path where the output PDF will be saved.
+
+    Returns:
+        The rendered PDF document.
     """
-    HTML(html_path).write_pdf(pdf_path)
+    return HTML(html_path).write_pdf()
 
 
-def merge_pdfs(pdf_paths: list, output_path: str) -> None:
+def merge_pdfs(pdfs: list, output_path: str) -> None:
     """
-    Merge multiple PDF files into one.
+    Merge multiple PDF documents into one.
 
     Args:
-        pdf_paths: List of paths to PDF files to merge in order.
+        pdfs: List of PDF paths or binary file objects to merge in order.
         output_path: Path for the final merged PDF.
     """
-    merger = PdfMerger()
-    for pdf in pdf_paths:
-        merger.append(pdf)
+    writer = PdfWriter()
+    for pdf in pdfs:
+        # Skip copying each file's heading bookmarks; rebuilding the outline
+        # tree per input is most of the merge cost
+        writer.append(pdf, import_outline=False)
     with open(output_path, 'wb') as f_out:
-        merger.write(f_out)
+        writer.write(f_out)
 
 
 def main() -> None:
@@ -72,39 +79,42 @@ def main() -> None:
     parser.add_argument(
         '--keep-individual',
         action='store_true',
-        help='If set, individual PDFs will not be removed after merging.'
+        help='If set, the individual PDFs are also written next to the HTML files.'
     )
     args = parser.parse_args()
 
     # Gather and sort HTML files
-    html_files = [f for f in os.listdir(args.input_dir) if f.lower().endswith('.html')]
-    html_files.sort()  # Ensure consistent order; adjust if natural sorting is needed
+    html_files = sorted(  # Ensure consistent order; adjust if natural sorting is needed
+        e.name for e in os.scandir(args.input_dir)
+        if e.is_file() and e.name.lower().endswith('.html')
+    )
 
     if not html_files:
         print(f"No HTML files found in {args.input_dir}.")
         return
 
-    pdf_paths = []
-    # Convert each HTML to a PDF with an index suffix
-    for idx, html_file in enumerate(html_files, start=1):
-        html_path = os.path.join(args.input_dir, html_file)
-        base_name = os.path.splitext(html_file)[0]
-        pdf_name = f"{base_name}_{idx}.pdf"
-        pdf_path = os.path.join(args.input_dir, pdf_name)
-        print(f"Converting {html_file} -> {pdf_name}...")
-        convert_html_to_pdf(html_path, pdf_path)
-        pdf_paths.append(pdf_path)
-
-    # Merge individual PDFs
-    print(f"Merging {len(pdf_paths)} PDF files into {args.output}...")
-    merge_pdfs(pdf_paths, args.output)
+    html_paths = [os.path.join(args.input_dir, f) for f in html_files]
+
+    # WeasyPrint layout is CPU-bound Python, so render the files in parallel
+    # worker processes rather than threads; the PDFs come back as bytes and
+    # never touch the disk unless asked for
+    print(f"Converting {len(html_paths)} HTML files...")
+    with ProcessPoolExecutor(max_workers=min(len(html_paths), os.cpu_count() or 1)) as ex:
+        documents = list(ex.map(convert_html_to_pdf, html_paths))
+
+    # Optionally save the individual PDFs with an index suffix
+    if args.keep_individual:
+        for idx, (html_file, document) in enumerate(zip(html_files, documents), start=1):
+            base_name = os.path.splitext(html_file)[0]
+            pdf_name = f"{base_name}_{idx}.pdf"
+            with open(os.path.join(args.input_dir, pdf_name), 'wb') as f_out:
+                f_out.write(document)
+            print(f"Saved {html_file} -> {pdf_name}")
+
+    # Merge the in-memory PDFs
+    print(f"Merging {len(documents)} PDF documents into {args.output}...")
+    merge_pdfs([io.BytesIO(document) for document in documents], args.output)
     print("Merge complete.")
 
-    # Optionally clean up individual PDFs
-    if not args.keep_individual:
-        for pdf in pdf_paths:
-            os.remove(pdf)
-        print("Removed individual PDF files.")
-
 if __name__ == '__main__':
     main()
@@ -1,8 +1,29 @@
 pacman -Qi \
   | awk -F ': +' '
+      # Quicksort idx[lo..hi] by bytes[], largest first (POSIX awk has no sort)
+      function qsort(idx, bytes, lo, hi,    i, last, t) {
+          if (lo >= hi) return
+          t = idx[lo]; idx[lo] = idx[int((lo + hi) / 2)]; idx[int((lo + hi) / 2)] = t
+          last = lo
+          for (i = lo + 1; i <= hi; i++)
+              if (bytes[idx[i]] > bytes[idx[lo]]) {
+                  t = idx[++last]; idx[last] = idx[i]; idx[i] = t
+              }
+          t = idx[lo]; idx[lo] = idx[last]; idx[last] = t
+          qsort(idx, bytes, lo, last - 1)
+          qsort(idx, bytes, last + 1, hi)
+      }
       /^Name/           { pkg = $2 }
-      /^Installed Size/ { printf "%-30s %s%s\n", pkg, $2, $3 }
-    ' \
-  | sort -hr -k2 \
-  | sed -E 's/([0-9.]+)(KiB|MiB|GiB)$/\1 \2/'
-
+      /^Installed Size/ {
+          split($2, v, " ")
+          mult = v[2] == "GiB" ? 1073741824 : v[2] == "MiB" ? 1048576 : v[2] == "KiB" ? 1024 : 1
+          n++
+          idx[n] = n
+          bytes[n] = v[1] * mult
+          line[n] = sprintf("%-30s %s %s", pkg, v[1], v[2])
+      }
+      END {
+          qsort(idx, bytes, 1, n)
+          for (i = 1; i <= n; i++) print line[idx[i]]
+      }
+    '
@@ -1,9 +1,8 @@
 #!/usr/bin/env python
 import matplotlib.pyplot as plt
-import networkx as nx
-
-# Create a directed graph
-G = nx.DiGraph()
+import numpy as np
+from matplotlib.collections import PatchCollection
+from matplotlib.patches import FancyBboxPatch
 
 # Define nodes with multi-line labels
 nodes = {
@@ -17,9 +16,6 @@ nodes = {
     "Circular": "Circular Reasoning:\nAll Outcomes\nConfirm the Model"
 }
 
-# Add nodes to the graph
-G.add_nodes_from(nodes.keys())
-
 # Define edges (logical flow)
 edges = [
     ("A_or_B", "Obs_A"),
@@ -33,7 +29,6 @@ edges = [
     ("Conc_A", "Circular"),
     ("Conc_B", "Circular"),
 ]
-G.add_edges_from(edges)
 
 # Positions carefully laid out for readability
 pos = {
@@ -59,21 +54,41 @@ node_colors = {
     "Circular": "#FF6961",  # red (slightly softer)
 }
 
-# Convert node_colors dict to a list matching G.nodes() order
-colors = [node_colors[node] for node in G.nodes()]
+# Node box size in data units (large enough for the multiline labels)
+BOX_W, BOX_H = 1.5, 0.95
 
 # Plot settings
-plt.figure(figsize=(12, 7))  # Wider figure to accommodate text
-nx.draw_networkx(
-    G, pos,
-    labels=nodes,          # use our custom labels
-    node_color=colors,     # color array
-    edge_color="black",
-    node_size=7000,        # larger nodes to fit multiline text
-    font_size=9,           # slightly smaller font for multiline
-    font_weight="bold",
-    arrows=True
-)
+fig, ax = plt.subplots(figsize=(12, 7))  # Wider figure to accommodate text
+
+# All nodes as one PatchCollection instead of one artist per node
+boxes = [
+    FancyBboxPatch((x - BOX_W / 2, y - BOX_H / 2), BOX_W, BOX_H,
+                   boxstyle="round,pad=0.05", facecolor=node_colors[n],
+                   edgecolor="black")
+    for n, (x, y) in pos.items()
+]
+ax.add_collection(PatchCollection(boxes, match_original=True, zorder=2))
+
+# All edges as a single quiver (one collection with arrowheads), clipped so
+# they start and end on the box borders rather than the node centres
+src = np.array([pos[u] for u, _ in edges], dtype=float)
+dst = np.array([pos[v] for _, v in edges], dtype=float)
+d = dst - src
+with np.errstate(divide="ignore"):
+    t = np.min(np.abs(np.array([BOX_W / 2 + 0.05, BOX_H / 2 + 0.05]) / d), axis=1)
+starts = src + d * t[:, None]
+vecs = d * (1 - 2 * t)[:, None]
+ax.quiver(starts[:, 0], starts[:, 1], vecs[:, 0], vecs[:, 1],
+          angles="xy", scale_units="xy", scale=1, color="black",
+          width=0.002, headwidth=6, headlength=8, zorder=1)
+
+for n, (x, y) in pos.items():
+    ax.text(x, y, nodes[n], ha="center", va="center",
+            fontsize=9, fontweight="bold", zorder=3)
+
+xs, ys = zip(*pos.values())
+ax.set_xlim(min(xs) - BOX_W, max(xs) + BOX_W)
+ax.set_ylim(min(ys) - BOX_H, max(ys) + BOX_H)
 
 plt.title("Logical Flaw in Place vs. Response Learning Paradigm", fontsize=14, fontweight="bold")
 plt.axis("off")
@@ -37,6 +37,7 @@ Requirements:
   • Python 3.6+ (for built-in json and csv modules).
   • `lsd` binary in your PATH, of a version that supports `--json`.
   • No external Python dependencies required.
+  • Optional: `orjson` (pip install orjson) for faster parsing of large listings.
 
 Example:
     # 1) Simply export the default `lsd -l` of the current directory:
@@ -58,6 +59,13 @@ import json
 import csv
 import sys
 
+# Optional orjson: parses lsd's JSON several times faster than the stdlib
+try:
+    import orjson
+    _ORJSON = True
+except ModuleNotFoundError:
+    _ORJSON = False
+
 def parse_args():
     """
     Parse command-line arguments.
@@ -88,6 +96,25 @@ def parse_args():
     )
     return parser.parse_args()
 
+def _triad_digit(trio):
+    """
+    Octal digit (as a string) for one rwx triad such as "rwx", "r-x" or "r--".
+    """
+    value = 0
+    if trio[0] == 'r':
+        value += 4
+    if trio[1] == 'w':
+        value += 2
+    # We treat both 'x' and special bits 's'/'t' as execute for simplicity:
+    if trio[2] in ('x', 's', 't'):
+        value += 1
+    return str(value)
+
+# Every triad lsd prints, mapped to its digit once at import time, so the
+# per-entry conversion is three dict lookups instead of nine comparisons.
+_TRIAD_DIGITS = {r + w + x: _triad_digit(r + w + x)
+                 for r in "r-" for w in "w-" for x in "xsStT-"}
+
 def permission_string_to_octal(perm_string):
     """
     Convert a permission string like "drwxr-xr-x" into a three-digit octal string, e.g. "755".
@@ -105,25 +132,12 @@ def permission_string_to_octal(perm_string):
     if not isinstance(perm_string, str) or len(perm_string) < 10:
         return ""
 
-    # Ignore the file-type character at index 0:
-    triads = perm_string[1:10]  # this should be exactly 9 chars: e.g. "rwxr-xr-x"
-    octal_digits = []
-
-    # Break into three sets of three characters:
-    for i in range(0, 9, 3):
-        trio = triads[i:i+3]  # e.g. "rwx", "r-x", "r--"
-        value = 0
-        if trio[0] == 'r':
-            value += 4
-        if trio[1] == 'w':
-            value += 2
-        # We treat both 'x' and special bits 's'/'t' as execute for simplicity:
-        if trio[2] in ('x', 's', 't'):
-            value += 1
-        octal_digits.append(str(value))
-
-    # Join the three numbers, e.g. ["7","5","5"] → "755"
-    return "".join(octal_digits)
+    # Ignore the file-type character at index 0 and look up the three triads;
+    # anything outside the table (unexpected characters) is computed directly.
+    return "".join(
+        _TRIAD_DIGITS.get(trio) or _triad_digit(trio)
+        for trio in (perm_string[1:4], perm_string[4:7], perm_string[7:10])
+    )
 
 def run_lsd_json(target_dir, extra_flags):
     """
@@ -149,24 +163,25 @@ def run_lsd_json(target_dir, extra_flags):
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            check=True,
-            encoding="utf-8"
+            check=True
         )
     except subprocess.CalledProcessError as e:
         sys.stderr.write(
             f"\nError: `lsd` exited with status {e.returncode}.\n"
             f"Command: {' '.join(cmd)}\n"
-            f"Stderr output:\n{e.stderr}\n"
+            f"Stderr output:\n{e.stderr.decode('utf-8', 'replace')}\n"
         )
         sys.exit(1)
 
+    # Both parsers take the raw bytes, so stdout is never decoded to str first;
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError.
     try:
-        data = json.loads(completed.stdout)
+        data = orjson.loads(completed.stdout) if _ORJSON else json.loads(completed.stdout)
     except json.JSONDecodeError as e:
         sys.stderr.write(
             f"\nError: Failed to parse JSON output from `lsd`.\n"
             f"JSONDecodeError: {e}\n"
-            f"Raw output:\n{completed.stdout}\n"
+            f"Raw output:\n{completed.stdout.decode('utf-8', 'replace')}\n"
         )
         sys.exit(1)
 
@@ -199,27 +214,23 @@ def write_csv(records, output_filename):
         "name"
     ]
 
-    with open(output_filename, mode="w", newline="", encoding="utf-8") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for rec in records:
-            # Extract the textual rwx string (or default to empty)
-            perm_str = rec.get("permissions", "")
-
-            # Compute the octal mode from perm_str
-            octal = permission_string_to_octal(perm_str)
-
-            row = {
-                "permissions": perm_str,
-                "octal_mode":  octal,
-                "user":        rec.get("user", ""),
-                "group":       rec.get("group", ""),
-                "size":        rec.get("size", ""),
-                "modified":    rec.get("modified", ""),
-                "name":        rec.get("name", "")
-            }
-            writer.writerow(row)
+    # Plain csv.writer over tuples: no per-row dict to build and re-index
+    with open(output_filename, mode="w", newline="", encoding="utf-8",
+              buffering=1 << 20) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            (
+                rec.get("permissions", ""),
+                permission_string_to_octal(rec.get("permissions", "")),
+                rec.get("user", ""),
+                rec.get("group", ""),
+                rec.get("size", ""),
+                rec.get("modified", ""),
+                rec.get("name", ""),
+            )
+            for rec in records
+        )
 
     print(f"Successfully wrote {len(records)} entries to '{output_filename}'.")
 
@@ -17,7 +17,9 @@ import argparse, csv, html, os, re, sys, time, json, pathlib, concurrent.futures
 from collections import namedtuple
 from datetime import datetime, timezone
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from dateutil.parser import isoparse
 from rapidfuzz import fuzz, process
 from rich.console import Console
@@ -34,6 +36,24 @@ try:
 except ModuleNotFoundError:
     _REPORTLAB = False
 
+# --------------------------------------------------------------------- #
+# Optional requests-cache (on-disk HTTP cache with conditional GETs)    #
+# --------------------------------------------------------------------- #
+try:
+    import requests_cache
+    _REQUESTS_CACHE = True
+except ModuleNotFoundError:
+    _REQUESTS_CACHE = False
+
+# --------------------------------------------------------------------- #
+# Optional ijson (streams conda repodata instead of loading it whole)   #
+# --------------------------------------------------------------------- #
+try:
+    import ijson
+    _IJSON = True
+except ModuleNotFoundError:
+    _IJSON = False
+
 # --------------------------------------------------------------------- #
 # Constants & endpoints                                                 #
 # --------------------------------------------------------------------- #
@@ -45,33 +65,99 @@ CONDA_SUBDIRS = ("noarch", "linux-64")        # plenty for name discovery
 CONDA_TMPL    = "https://conda.anaconda.org/conda-forge/{subdir}/current_repodata.json"
 CACHE_DIR     = pathlib.Path.home() / ".cache" / "pypi_rank"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
+PYPI_CACHE    = CACHE_DIR / "pypi_index.json"     # refreshed every 6 h
+PYPI_STALE    = 6*3600                            # seconds
 CONDA_CACHE   = CACHE_DIR / "conda_names.json"    # refreshed every 24 h
 CONDA_STALE   = 24*3600                           # seconds
+HTTP_CACHE    = CACHE_DIR / "pypi_http.sqlite"    # per-package JSON, revalidated
+HTTP_STALE    = 3600                              # seconds
 
 console = Console()
 PKG = namedtuple("PKG", "name summary released downloads conda")
 
+# --------------------------------------------------------------------- #
+# HTTP session                                                          #
+# --------------------------------------------------------------------- #
+def make_session(pool_size: int = 16) -> requests.Session:
+    """One keep-alive session shared by all worker threads, so each host
+    costs a single TCP+TLS handshake per pooled connection.
+
+    With requests-cache installed, responses are kept in HTTP_CACHE and
+    revalidated via ETag / Last-Modified once older than HTTP_STALE, so
+    unchanged packages cost a 304 instead of a full download."""
+    if _REQUESTS_CACHE:
+        sess = requests_cache.CachedSession(
+            HTTP_CACHE, backend="sqlite", expire_after=HTTP_STALE,
+            cache_control=True,
+            # the name lists already have their own caches
+            urls_expire_after={"pypi.org/simple": requests_cache.DO_NOT_CACHE,
+                               "conda.anaconda.org": requests_cache.DO_NOT_CACHE})
+    else:
+        sess = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+
+_session = None  # built on first use, or by main() with --threads
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it (and its cache) on first call."""
+    global _session
+    if _session is None:
+        _session = make_session()
+    return _session
+
+
 # --------------------------------------------------------------------- #
 # PyPI helpers                                                          #
 # --------------------------------------------------------------------- #
-def fetch_pypi_index() -> list[str]:
-    r = requests.get(SIMPLE_URL, timeout=20)
+def _download_pypi_index() -> list[str]:
+    # PEP 691 JSON form of the simple index: far smaller and faster to parse
+    # than scraping the HTML listing.
+    r = get_session().get(SIMPLE_URL, timeout=20,
+                          headers={"Accept": "application/vnd.pypi.simple.v1+json"})
     r.raise_for_status()
-    return [html.unescape(n) for n in
-            re.findall(r'<a href="/simple/[^"]+">([^<]+)</a>', r.text, re.I)]
+    if "json" in r.headers.get("Content-Type", ""):
+        return [p["name"] for p in r.json()["projects"]]
+    # mirror without PEP 691 support: fall back to the HTML listing
+    return [html.unescape(n) for n in re.findall(r'<a [^>]*>([^<]+)</a>', r.text, re.I)]
+
+def fetch_pypi_index() -> list[str]:
+    """Lazy-load cached PyPI project names, refresh if older than 6 h."""
+    if PYPI_CACHE.exists() and time.time() - PYPI_CACHE.stat().st_mtime < PYPI_STALE:
+        try:
+            return json.loads(PYPI_CACHE.read_text())
+        except Exception:
+            pass
+    names = _download_pypi_index()
+    try:
+        PYPI_CACHE.write_text(json.dumps(names))
+    except Exception:
+        pass
+    return names
+
+MIN_PREFILTER = 50   # fewer substring hits than this -> score the full index
 
 def best_pypi_matches(query: str, candidates: list[str], k: int = 400) -> list[str]:
-    scored = process.extract(query, candidates, scorer=fuzz.QRatio, limit=k)
+    # Cheap substring pass first: it cuts ~900k names to a few hundred, and
+    # names containing the query dominate the fuzzy ranking anyway.
+    q = query.casefold()
+    pool = [n for n in candidates if q in n.casefold()]
+    if len(pool) < MIN_PREFILTER:
+        pool = candidates
+    scored = process.extract(query, pool, scorer=fuzz.QRatio, limit=k)
     return [n for n, s, _ in scored if s >= 30]
 
 def pypi_meta(name: str) -> PKG | None:
     try:
-        meta   = requests.get(JSON_URL.format(name=name), timeout=15).json()
+        meta   = get_session().get(JSON_URL.format(name=name), timeout=15).json()
         info   = meta["info"]
         dates  = [isoparse(f["upload_time_iso_8601"])
                   for files in meta["releases"].values() for f in files]
         latest = max(dates) if dates else datetime(1970, 1, 1, tzinfo=timezone.utc)
-        stats  = requests.get(STATS_URL.format(name=name), timeout=15).json()
+        stats  = get_session().get(STATS_URL.format(name=name), timeout=15).json()
         dl30   = stats.get("data", {}).get("last_month", 0)
         return PKG(name, info.get("summary", "")[:60], latest, dl30, "")
     except Exception:
@@ -80,13 +166,41 @@ def pypi_meta(name: str) -> PKG | None:
 # --------------------------------------------------------------------- #
 # conda-forge helpers                                                   #
 # --------------------------------------------------------------------- #
+REPODATA_KEYS = ("packages", "packages.conda")   # .tar.bz2 and .conda builds
+
+def _stream_repodata_names(fp) -> set[str]:
+    """Collect packages.*.name from a repodata stream with ijson events, so
+    the tens-of-MB document is never materialised."""
+    names: set[str] = set()
+    depth, top, key = 0, None, None
+    for _, event, value in ijson.parse(fp):
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        elif event == "map_key":
+            if depth == 1:
+                top = value
+            elif depth == 3:
+                key = value
+        elif depth == 3 and key == "name" and top in REPODATA_KEYS:
+            names.add(value)
+    return names
+
 def _download_conda_names() -> set[str]:
     names: set[str] = set()
     for sub in CONDA_SUBDIRS:
         try:
-            data = requests.get(CONDA_TMPL.format(subdir=sub), timeout=40).json()
-            pkgs = data.get("packages", {})
-            names.update(meta["name"] for meta in pkgs.values())
+            with get_session().get(CONDA_TMPL.format(subdir=sub), timeout=40,
+                                   stream=_IJSON) as r:
+                r.raise_for_status()
+                if _IJSON:
+                    r.raw.decode_content = True
+                    names.update(_stream_repodata_names(r.raw))
+                    continue
+                data = r.json()
+            for key in REPODATA_KEYS:
+                names.update(meta["name"] for meta in data.get(key, {}).values())
         except Exception:
             continue
     return names
@@ -105,15 +219,25 @@ def load_conda_names() -> set[str]:
         pass
     return names
 
-def map_to_conda(pip_name: str, conda_names: set[str]) -> str:
-    """Return the most plausible conda-forge name (empty string if none)."""
+def map_to_conda(pip_names: list[str], conda_names: set[str]) -> list[str]:
+    """Return the most plausible conda-forge name for each pip name (empty
+    string if none). Names without an exact match are fuzzy-scored against
+    all conda names in a single, multi-threaded rapidfuzz cdist call."""
     canon = lambda s: s.lower().replace("_", "-")
-    pip_c = canon(pip_name)
-    if pip_c in conda_names:
-        return pip_c
+    pip_c = [canon(n) for n in pip_names]
+    out   = [c if c in conda_names else "" for c in pip_c]
+    todo  = [i for i, c in enumerate(out) if not c]
+    if not todo or not conda_names:
+        return out
     # heuristic fall-backs
-    match = process.extractOne(pip_c, conda_names, scorer=fuzz.QRatio)
-    return match[0] if match and match[1] >= 80 else ""
+    choices = list(conda_names)
+    scores  = process.cdist([pip_c[i] for i in todo], choices, scorer=fuzz.QRatio,
+                            score_cutoff=80, dtype=np.uint8, workers=-1)
+    best    = scores.argmax(axis=1)
+    for row, i in enumerate(todo):
+        if scores[row, best[row]] >= 80:
+            out[i] = choices[best[row]]
+    return out
 
 # --------------------------------------------------------------------- #
 # CSV / PDF writers                                                     #
@@ -174,6 +298,9 @@ def main() -> None:
     ag.add_argument("--pdf", metavar="FILE", help="export to PDF (ReportLab)")
     args = ag.parse_args()
 
+    global _session
+    _session = make_session(args.threads)
+
     console.status("[green bold]Fetching PyPI index…")
     all_pkgs = fetch_pypi_index()
     cand = best_pypi_matches(args.query, all_pkgs, k=600)
@@ -187,9 +314,8 @@ def main() -> None:
     if args.with_conda:
         console.status("[green bold]Loading conda-forge names…")
         conda_names = load_conda_names()
-        for i in range(len(rows)):
-            rows[i] = rows[i]._replace(
-                conda=map_to_conda(rows[i].name, conda_names))
+        mapped = map_to_conda([r.name for r in rows], conda_names)
+        rows = [r._replace(conda=c) for r, c in zip(rows, mapped)]
 
     # sort + trim -----------------------------------------------------------
     rows.sort(key=(lambda p: p.released) if args.sort == "latest"
@@ -22,7 +22,7 @@ import re
 import subprocess
 import sys
 import time
-from collections import namedtuple
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 import requests
@@ -45,7 +45,19 @@ CONDA_CACHE = CACHE_DIR / "conda_names.json"
 CONDA_STALE = 24 * 3600  # seconds
 
 console = Console()
-PKG = namedtuple("PKG", "name summary released downloads conda")
+
+
+@dataclass(slots=True)
+class PKG:
+    name: str
+    summary: str
+    released: datetime
+    downloads: int
+    conda: str = ""
+
+
+_TOKEN_SPLIT = re.compile(r"[\s,]+")
+_HREF = re.compile(r'<a href="/simple/[^\"]+">([^<]+)</a>', re.I)
 
 # --------------------------------------------------------------------- #
 # Utility: parse user selection string into list of indices             #
@@ -56,13 +68,13 @@ def parse_selection(selection: str, max_index: int) -> list[int]:
     Raises ValueError if any token is invalid or out of range.
     """
     indices: set[int] = set()
-    tokens = re.split(r"[\s,]+", selection.strip())
-    for token in tokens:
+    for token in _TOKEN_SPLIT.split(selection.strip()):
         if not token:
             continue
-        m = re.match(r"^(\d+)-(\d+)$", token)
-        if m:
-            start, end = int(m.group(1)), int(m.group(2))
+        # "a-b" ranges via partition; no regex needed per token
+        a, sep, b = token.partition("-")
+        if sep and a.isdigit() and b.isdigit():
+            start, end = int(a), int(b)
             if start < 1 or end > max_index or start > end:
                 raise ValueError(f"Range '{token}' out of valid bounds 1-{max_index}")
             indices.update(range(start, end + 1))
@@ -78,14 +90,18 @@ def parse_selection(selection: str, max_index: int) -> list[int]:
 # --------------------------------------------------------------------- #
 # Helper: parse ISO8601 timestamps without extra dependencies            #
 # --------------------------------------------------------------------- #
-def parse_iso8601(dt_str: str) -> datetime:
-    """
-    Convert an ISO 8601 string (with 'Z' or offset) into a timezone-aware datetime.
-    """
-    # Handle trailing 'Z' as UTC
-    if dt_str.endswith('Z'):
-        dt_str = dt_str[:-1] + '+00:00'
-    return datetime.fromisoformat(dt_str)
+if sys.version_info >= (3, 11):
+    # fromisoformat() accepts a trailing 'Z' natively since 3.11
+    parse_iso8601 = datetime.fromisoformat
+else:
+    def parse_iso8601(dt_str: str) -> datetime:
+        """
+        Convert an ISO 8601 string (with 'Z' or offset) into a timezone-aware datetime.
+        """
+        # Handle trailing 'Z' as UTC
+        if dt_str.endswith('Z'):
+            dt_str = dt_str[:-1] + '+00:00'
+        return datetime.fromisoformat(dt_str)
 
 # --------------------------------------------------------------------- #
 # PyPI helpers                                                          #
@@ -94,7 +110,7 @@ def fetch_pypi_index() -> list[str]:
     r = requests.get(SIMPLE_URL, timeout=20)
     r.raise_for_status()
     return [html.unescape(n) for n in
-            re.findall(r'<a href="/simple/[^\"]+">([^<]+)</a>', r.text, re.I)]
+            _HREF.findall(r.text)]
 
 def best_pypi_matches(query: str, candidates: list[str], k: int = 400) -> list[str]:
     scored = process.extract(query, candidates, scorer=fuzz.QRatio, limit=k)
@@ -106,9 +122,14 @@ def pypi_meta(name: str) -> PKG | None:
         meta = requests.get(JSON_URL.format(name=name), timeout=15).json()
         info = meta["info"]
         # Parse upload timestamps without dateutil
-        dates = [parse_iso8601(f["upload_time_iso_8601"])
-                 for files in meta.get("releases", {}).values() for f in files]
-        latest = max(dates) if dates else datetime(1970, 1, 1, tzinfo=timezone.utc)
+        # PyPI's stamps are all UTC isoformat() strings, but the microseconds
+        # are left out when zero, so only the "YYYY-MM-DDTHH:MM:SS" prefix is
+        # fixed width: compare on that and parse only the newest stamp
+        newest = max((f["upload_time_iso_8601"]
+                      for files in meta.get("releases", {}).values() for f in files),
+                     key=lambda stamp: stamp[:19], default=None)
+        latest = (parse_iso8601(newest) if newest
+                  else datetime(1970, 1, 1, tzinfo=timezone.utc))
         stats = requests.get(STATS_URL.format(name=name), timeout=15).json()
         dl30 = stats.get("data", {}).get("last_month", 0)
         return PKG(name, info.get("summary", "")[:60], latest, dl30, "")
@@ -160,9 +181,9 @@ def write_csv(path: str, records: list[PKG]) -> None:
         w = csv.writer(fh)
         w.writerow(["rank", "package", "conda_name",
                     "released_utc", "downloads_30d", "summary"])
-        for r, p in enumerate(records, 1):
-            w.writerow([r, p.name, p.conda,
-                        p.released.strftime("%Y-%m-%d"), p.downloads, p.summary])
+        w.writerows((r, p.name, p.conda, p.released.strftime("%Y-%m-%d"),
+                     p.downloads, p.summary)
+                    for r, p in enumerate(records, 1))
 
 
 def write_pdf(path: str, query: str, criterion: str, records: list[PKG]) -> None:
@@ -188,16 +209,31 @@ def write_pdf(path: str, query: str, criterion: str, records: list[PKG]) -> None
         cvs.drawString(x, y, h)
     y -= lh
     cvs.line(margin, y+2, PAGE_W-margin, y+2)
-    for r, p in enumerate(records, 1):
-        if r > max_rows:
-            break
-        cvs.drawString(col[0], y, str(r))
-        cvs.drawString(col[1], y, p.name)
-        cvs.drawString(col[2], y, p.conda or "—")
-        cvs.drawString(col[3], y, p.released.strftime("%Y-%m-%d"))
-        cvs.drawRightString(col[4]+0.6*inch, y, f"{p.downloads:,}")
-        cvs.drawString(col[5], y, p.summary[:80])
-        y -= lh
+    # One text object per column instead of a drawString (a separate BT/ET
+    # block) per cell
+    shown = records[:max_rows]
+    cells = ([str(r) for r in range(1, len(shown) + 1)],
+             [p.name for p in shown],
+             [p.conda or "—" for p in shown],
+             [p.released.strftime("%Y-%m-%d") for p in shown],
+             None,
+             [p.summary[:80] for p in shown])
+    for x, column in zip(col, cells):
+        if column is None:
+            continue
+        txt = cvs.beginText(x, y)
+        txt.setLeading(lh)
+        for cell in column:
+            txt.textLine(cell)
+        cvs.drawText(txt)
+    # downloads are right-aligned, so each line gets its own origin
+    right = col[4] + 0.6*inch
+    txt = cvs.beginText()
+    for i, p in enumerate(shown):
+        dl = f"{p.downloads:,}"
+        txt.setTextOrigin(right - cvs.stringWidth(dl), y - i*lh)
+        txt.textOut(dl)
+    cvs.drawText(txt)
     cvs.save()
 
 # --------------------------------------------------------------------- #
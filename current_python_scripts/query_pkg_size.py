@@ -3,8 +3,8 @@
 Script: query_package_sizes.py
 Description:
     For each package provided as command line argument, or from a default list if no
-    arguments are provided, this script calls 'pacman -Si <package>',
-    extracts the "Installed Size" value, converts it to a baseline in KiB and then
+    arguments are provided, this script calls 'pacman -Si <package>...' once for all
+    of them, extracts the "Installed Size" value, converts it to a baseline in KiB and then
     dynamically formats and prints the size in KiB, MiB, or GiB.
     
 Usage:
@@ -24,34 +24,59 @@ import re
 import subprocess
 import sys
 
-def query_installed_size(pkg: str) -> str:
+# pacman output is ASCII, so match on raw bytes and decode only the captures.
+_NAME_RE = re.compile(rb"^Name\s*:\s*(\S+)", re.MULTILINE)
+_REPO_RE = re.compile(rb"^Repository\s*:\s*(\S+)", re.MULTILINE)
+_SIZE_RE = re.compile(rb"Installed Size\s*:\s*([\d\.,]+)\s*(KiB|MiB|GiB)")
+
+def query_installed_sizes(packages: list[str]) -> dict[str, str]:
     """
-    Queries pacman for package info and extracts the Installed Size.
-    
+    Queries pacman once for all packages and extracts each Installed Size.
+
     Args:
-        pkg: Package name as a string.
-    
+        packages: Package names, optionally as repo/name (e.g. extra/firefox).
+
+    Returns:
+        A dict mapping each package name to its formatted size (see
+        format_installed_size), or "Not found" if it is not available.
+    """
+    # pacman prints one blank-line separated block per package it finds and
+    # reports the missing ones on stderr (exiting non-zero), so no check=True.
+    result = subprocess.run(['pacman', '-Si', *dict.fromkeys(packages)],
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL)
+    blocks = {}
+    for block in result.stdout.split(b"\n\n"):
+        match = _NAME_RE.search(block)
+        if match:
+            name = match.group(1).decode()
+            # Keep the first repo's entry if a package appears in several;
+            # repo/name arguments are looked up under their own key.
+            blocks.setdefault(name, block)
+            repo = _REPO_RE.search(block)
+            if repo:
+                blocks.setdefault(f"{repo.group(1).decode()}/{name}", block)
+
+    return {pkg: format_installed_size(blocks[pkg]) if pkg in blocks else "Not found"
+            for pkg in packages}
+
+def format_installed_size(output: bytes) -> str:
+    """
+    Extracts the Installed Size from one package's pacman info block.
+
+    Args:
+        output: The raw `pacman -Si` output for a single package.
+
     Returns:
         A formatted string with the size and unit (e.g., "48.28 MiB"),
-        or "Not found" if the package is not available.
+        or "Not found" if the field is missing.
     """
-    try:
-        # Run the pacman -Si command and decode its output.
-        result = subprocess.run(['pacman', '-Si', pkg],
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.DEVNULL,
-                                text=True,
-                                check=True)
-        output = result.stdout
-    except subprocess.CalledProcessError:
-        return "Not found"
-    
     # Look for the line that begins with "Installed Size"
-    match = re.search(r"Installed Size\s*:\s*([\d\.,]+)\s*(KiB|MiB|GiB)", output)
+    match = _SIZE_RE.search(output)
     if not match:
         return "Not found"
 
-    num_str, unit = match.groups()
+    num_str, unit = (g.decode() for g in match.groups())
     # Replace comma with a period for proper float conversion (locale issues).
     num_str = num_str.replace(",", ".")
     
@@ -114,9 +139,10 @@ def main():
     print(f"{header_pkg:<30} {header_size:<20}")
     print("-" * 50)
     
-    # Process each package and print the size information.
+    # Query all packages in one pacman call, then print the size information.
+    sizes = query_installed_sizes(packages)
     for pkg in packages:
-        size_formatted = query_installed_size(pkg)
+        size_formatted = sizes[pkg]
         print(f"{pkg:<30} {size_formatted:<20}")
 
 if __name__ == "__main__":
@@ -20,6 +20,7 @@ Optional Flags:
 
 import sys
 import json
+import functools
 import typing
 import argparse
 import subprocess
@@ -77,7 +78,7 @@ def disableMonitor(monitor_name: str, config_file: Path):
 
     try:
         # Execute the hyprctl command to disable the specified monitor.
-        subprocess.check_call(f'hyprctl keyword monitor {monitor_name},disable', shell=True)
+        setMonitorKeyword(f'{monitor_name},disable')
     except CalledProcessError as e:
         raise RuntimeError(f"Error executing hyprctl command: {e}")
 
@@ -107,7 +108,7 @@ def enableMonitor(
                 printError("Unable to find monitor state file. Use '--defaults' to use preferred auto configuration instead.")
                 return
             # Use default configuration if state file is missing.
-            subprocess.check_call(f'hyprctl keyword monitor {monitor_name},preferred,auto,1', shell=True)
+            setMonitorKeyword(f'{monitor_name},preferred,auto,1')
         else:
             # Load the saved monitor configuration.
             with config_file.open('r') as fd:
@@ -124,7 +125,7 @@ def enableMonitor(
                 scale=monitor['scale']
             )
 
-            subprocess.check_call(f'hyprctl keyword monitor {monitor_cfg}', shell=True)
+            setMonitorKeyword(monitor_cfg)
     except CalledProcessError as e:
         raise RuntimeError(f"Error executing hyprctl command: {e}")
 
@@ -158,11 +159,23 @@ def getMonitorConfig(name: typing.Optional[str] = None, silent: bool = False) ->
         raise RuntimeError(f"Error executing hyprctl command: {e}")
 
 
+@functools.lru_cache(maxsize=1)
 def getMonitors() -> typing.Any:
     """
     Retrieves the list of current monitors and their properties from hyprctl in JSON format.
+
+    The result is cached, so getFocusedMonitorName() and getMonitorConfig() share a
+    single hyprctl call; setMonitorKeyword() invalidates it.
+    """
+    return json.loads(subprocess.check_output(['hyprctl', 'monitors', '-j']))
+
+
+def setMonitorKeyword(monitor_cfg: str):
+    """
+    Applies a 'hyprctl keyword monitor' rule (run directly, without a shell).
     """
-    return json.loads(subprocess.check_output('hyprctl monitors -j', shell=True))
+    subprocess.check_call(['hyprctl', 'keyword', 'monitor', monitor_cfg])
+    getMonitors.cache_clear()
 
 
 def printError(*args, **kwargs):
@@ -14,23 +14,56 @@ Usage examples
 ./python-search neuro --sort latest --with-conda --csv neuro.csv --pdf neuro.pdf
 """
 import argparse
+import asyncio
 import csv
+import hashlib
 import html
 import json
 import pathlib
 import re
+import shutil
 import subprocess
 import sys
 import time
-from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
+import numpy as np
 import requests
-from dateutil.parser import isoparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
 from rich.console import Console
 from rich.table import Table
 
+try:
+    import aiohttp
+    _AIOHTTP = True
+except ModuleNotFoundError:
+    _AIOHTTP = False
+
+# Optional faster JSON decoders; msgspec also skips unused repodata fields
+try:
+    import orjson
+    _ORJSON = True
+except ModuleNotFoundError:
+    _ORJSON = False
+
+try:
+    import msgspec
+    _MSGSPEC = True
+except ModuleNotFoundError:
+    _MSGSPEC = False
+
+# Optional ijson (streams conda repodata instead of loading it whole)
+try:
+    import ijson
+    _IJSON = True
+except ModuleNotFoundError:
+    _IJSON = False
+
 # --------------------------------------------------------------------- #
 # Constants & endpoints                                                 #
 # --------------------------------------------------------------------- #
@@ -44,9 +77,45 @@ CACHE_DIR = pathlib.Path.home() / ".cache" / "pypi_rank"
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 CONDA_CACHE = CACHE_DIR / "conda_names.json"
 CONDA_STALE = 24 * 3600  # seconds
+# Not pypi_index.json: pypi.py keeps a plain name list there, this holds a dict
+SIMPLE_CACHE = CACHE_DIR / "pypi_index_processed.json"
+SIMPLE_STALE = 6 * 3600  # seconds
+HTTP_CACHE = CACHE_DIR / "http"  # validators + bodies for conditional GETs
+HTTP_CACHE.mkdir(exist_ok=True)
+
+USER_AGENT = "pypi-rank/1.0"
 
 console = Console()
-PKG = namedtuple("PKG", "name summary released downloads conda")
+
+
+@dataclass(slots=True)
+class PKG:
+    name: str
+    summary: str
+    released: datetime
+    downloads: int
+    conda: str = ""
+    # Display strings shared by the table, CSV and PDF; see format_rows()
+    released_day: str = field(default="", init=False, repr=False)
+    downloads_fmt: str = field(default="", init=False, repr=False)
+
+
+def format_rows(rows: list[PKG]) -> None:
+    """Format the date and download count of each displayed row once."""
+    for p in rows:
+        p.released_day = p.released.date().isoformat()  # no strftime/locale
+        p.downloads_fmt = f"{p.downloads:,}"
+
+
+_TOKEN_SPLIT = re.compile(r"[\s,]+")
+_HREF = re.compile(r'<a href="/simple/[^\"]+">([^<]+)</a>', re.I)
+
+def _loads(data: bytes):
+    return orjson.loads(data) if _ORJSON else json.loads(data)
+
+
+def _dumps(obj) -> bytes:
+    return orjson.dumps(obj) if _ORJSON else json.dumps(obj).encode()
 
 # --------------------------------------------------------------------- #
 # Utility: parse user selection string into list of indices             #
@@ -57,13 +126,13 @@ def parse_selection(selection: str, max_index: int) -> list[int]:
     Raises ValueError if any token is invalid or out of range.
     """
     indices: set[int] = set()
-    tokens = re.split(r"[\s,]+", selection.strip())
-    for token in tokens:
+    for token in _TOKEN_SPLIT.split(selection.strip()):
         if not token:
             continue
-        m = re.match(r"^(\d+)-(\d+)$", token)
-        if m:
-            start, end = int(m.group(1)), int(m.group(2))
+        # "a-b" ranges via partition; no regex needed per token
+        a, sep, b = token.partition("-")
+        if sep and a.isdigit() and b.isdigit():
+            start, end = int(a), int(b)
             if start < 1 or end > max_index or start > end:
                 raise ValueError(f"Range '{token}' out of valid bounds 1-{max_index}")
             indices.update(range(start, end + 1))
@@ -77,69 +146,372 @@ def parse_selection(selection: str, max_index: int) -> list[int]:
     return sorted(indices)
 
 # --------------------------------------------------------------------- #
-# PyPI helpers                                                          #
+# Helper: parse ISO8601 timestamps without extra dependencies            #
+# --------------------------------------------------------------------- #
+if sys.version_info >= (3, 11):
+    # fromisoformat() accepts a trailing 'Z' natively since 3.11
+    parse_iso8601 = datetime.fromisoformat
+else:
+    def parse_iso8601(dt_str: str) -> datetime:
+        """
+        Convert an ISO 8601 string (with 'Z' or offset) into a timezone-aware datetime.
+        """
+        # Handle trailing 'Z' as UTC
+        if dt_str.endswith('Z'):
+            dt_str = dt_str[:-1] + '+00:00'
+        return datetime.fromisoformat(dt_str)
+
+# --------------------------------------------------------------------- #
+# HTTP session                                                          #
+# --------------------------------------------------------------------- #
+def make_session() -> requests.Session:
+    """Keep-alive session shared by every request (and worker thread), with
+    retries for rate limiting and transient server errors. requests already
+    advertises every Content-Encoding urllib3 can decode (gzip, deflate, and
+    br/zstd when their modules are installed), so that header is left alone."""
+    sess = requests.Session()
+    sess.headers["User-Agent"] = USER_AGENT
+    adapter = HTTPAdapter(
+        pool_connections=64, pool_maxsize=64,
+        max_retries=Retry(total=3, backoff_factor=0.3,
+                          status_forcelist=[429, 500, 502, 503, 504]))
+    sess.mount("https://", adapter)
+    sess.mount("http://", adapter)
+    return sess
+
+SESSION = make_session()
+
+# --------------------------------------------------------------------- #
+# Conditional GET cache (ETag / Last-Modified)                          #
 # --------------------------------------------------------------------- #
-def fetch_pypi_index() -> list[str]:
-    r = requests.get(SIMPLE_URL, timeout=20)
+def _http_cache_paths(url: str) -> tuple[pathlib.Path, pathlib.Path]:
+    key = hashlib.sha1(url.encode()).hexdigest()
+    return HTTP_CACHE / f"{key}.json", HTTP_CACHE / f"{key}.body"
+
+
+def _validators(url: str) -> dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for the cached copy of url."""
+    meta_p, body_p = _http_cache_paths(url)
+    try:
+        entry = json.loads(meta_p.read_text())
+    except Exception:
+        return {}
+    if not body_p.exists():
+        return {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def _store(url: str, headers, body: bytes) -> None:
+    etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+    if not (etag or last_modified):
+        return
+    meta_p, body_p = _http_cache_paths(url)
+    try:
+        # Body first, so a validator never points at a missing body
+        body_p.write_bytes(body)
+        meta_p.write_text(json.dumps({"etag": etag, "last_modified": last_modified}))
+    except OSError:
+        pass
+
+
+def cached_get(url: str, timeout: float, headers: dict[str, str] | None = None) -> bytes:
+    """GET url, answering a 304 Not Modified from the on-disk copy."""
+    r = SESSION.get(url, headers={**(headers or {}), **_validators(url)}, timeout=timeout)
+    if r.status_code == 304:
+        return _http_cache_paths(url)[1].read_bytes()
     r.raise_for_status()
+    _store(url, r.headers, r.content)
+    return r.content
+
+
+async def cached_get_async(session, url: str) -> bytes:
+    """aiohttp counterpart of cached_get()."""
+    async with session.get(url, headers=_validators(url)) as resp:
+        if resp.status == 304:
+            return _http_cache_paths(url)[1].read_bytes()
+        resp.raise_for_status()
+        body = await resp.read()
+    _store(url, resp.headers, body)
+    return body
+
+def cached_download(url: str, timeout: float) -> pathlib.Path:
+    """Like cached_get(), but a 200 body is streamed straight into the cache
+    and the path of the (new or still valid) cached copy is returned."""
+    meta_p, body_p = _http_cache_paths(url)
+    with SESSION.get(url, headers=_validators(url), timeout=timeout, stream=True) as r:
+        if r.status_code == 304:
+            return body_p
+        r.raise_for_status()
+        part = body_p.with_suffix(".part")
+        with open(part, "wb") as fh:
+            for chunk in r.iter_content(1 << 20):
+                fh.write(chunk)
+    # Drop the old validators before swapping bodies, so they never pair up
+    meta_p.unlink(missing_ok=True)
+    part.replace(body_p)
+    etag, last_modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    if etag or last_modified:
+        try:
+            meta_p.write_text(json.dumps({"etag": etag, "last_modified": last_modified}))
+        except OSError:
+            pass
+    return body_p
+
+# --------------------------------------------------------------------- #
+# PyPI helpers                                                          #
+# --------------------------------------------------------------------- #
+def _download_pypi_index() -> list[str]:
+    # PEP 691 JSON form of the simple index: one decode, no HTML scraping.
+    # A 304 carries no Content-Type, so the cached body is sniffed instead.
+    body = cached_get(SIMPLE_URL, timeout=20,
+                      headers={"Accept": "application/vnd.pypi.simple.v1+json"})
+    if body.lstrip().startswith(b"{"):
+        return [p["name"] for p in _loads(body)["projects"]]
+    # mirror without PEP 691 support: fall back to the HTML listing
     return [html.unescape(n) for n in
-            re.findall(r'<a href="/simple/[^\"]+">([^<]+)</a>', r.text, re.I)]
+            _HREF.findall(body.decode("utf-8", "replace"))]
 
 
-def best_pypi_matches(query: str, candidates: list[str], k: int = 400) -> list[str]:
-    scored = process.extract(query, candidates, scorer=fuzz.QRatio, limit=k)
-    return [n for n, s, _ in scored if s >= 30]
+def fetch_pypi_index() -> tuple[list[str], list[str]]:
+    """Return (names, processed): the PyPI project names and their
+    rapidfuzz default_process() forms, cached together for 6 h so the
+    ~600k names are normalised once per download rather than per search."""
+    if SIMPLE_CACHE.exists() and time.time() - SIMPLE_CACHE.stat().st_mtime < SIMPLE_STALE:
+        try:
+            data = _loads(SIMPLE_CACHE.read_bytes())
+            return data["names"], data["processed"]
+        except Exception:
+            pass
+    names = _download_pypi_index()
+    processed = [default_process(n) for n in names]
+    try:
+        SIMPLE_CACHE.write_bytes(_dumps({"names": names, "processed": processed}))
+    except Exception:
+        pass
+    return names, processed
+
+
+MIN_PREFILTER = 50   # fewer substring hits than this -> score the full index
+
+
+def subseq_score(query: str, choice: str, *, score_cutoff: float | None = None,
+                 **kwargs) -> float:
+    """
+    FZF-style 0-100 score: every query character must occur in order in
+    choice (greedy leftmost). Each match earns points, with bonuses at the
+    start of a word (default_process() turns -_. into spaces) and for runs
+    of consecutive characters, and a penalty for each skipped character.
+    """
+    if not query:
+        return 0.0
+    score, pos, prev = 0, 0, -2
+    for ch in query:
+        i = choice.find(ch, pos)
+        if i < 0:
+            return 0.0
+        points = 16
+        if i == 0 or choice[i - 1] == " ":
+            points += 8
+        if i == prev + 1:
+            points += 4
+        if i > pos:
+            points -= 3 + (i - pos - 1)  # gap open + extension
+        score += points
+        pos, prev = i + 1, i
+    result = max(0.0, 100.0 * score / (28 * len(query)))
+    return result if score_cutoff is None or result >= score_cutoff else 0.0
+
+
+SCORERS = {"qratio": fuzz.QRatio, "subseq": subseq_score}
+
+
+def best_pypi_matches(query: str, candidates: list[str], processed: list[str],
+                      k: int = 400, scorer=fuzz.QRatio) -> list[str]:
+    q = default_process(query)
+    if scorer is subseq_score:
+        # Only names holding the query as a subsequence can score at all;
+        # the regex finds them in C, so the Python scorer sees just those.
+        rx = re.compile(".*?".join(map(re.escape, q)))
+        pool = {i: p for i, p in enumerate(processed) if rx.search(p)}
+    else:
+        # Cheap substring pass first: it cuts the ~600k-name index to a few
+        # hundred, and names containing the query dominate the fuzzy ranking
+        # anyway. Too few hits (typos, short names) -> score the full index.
+        pool = {i: p for i, p in enumerate(processed) if q in p}
+        if len(pool) < MIN_PREFILTER:
+            pool = processed
+    # Choices are already normalised; the cutoff lets the C++ core skip the rest
+    scored = process.extract(q, pool, scorer=scorer, processor=None,
+                             score_cutoff=30, limit=k)
+    return [candidates[i] for _, _, i in scored]
+
+
+META_TTL = 600  # seconds a fetched PKG is reused within one process
+_META_MEMO: dict[str, tuple[float, PKG]] = {}
+
+
+def _memoized(name: str) -> PKG | None:
+    hit = _META_MEMO.get(name)
+    return hit[1] if hit and time.monotonic() - hit[0] < META_TTL else None
+
+
+def _memoize(name: str, pkg: PKG) -> PKG:
+    _META_MEMO[name] = (time.monotonic(), pkg)
+    return pkg
+
+
+def _build_pkg(name: str, meta: dict, stats: dict) -> PKG:
+    info = meta["info"]
+    # PyPI's stamps are all UTC isoformat() strings, but the microseconds are
+    # left out when zero, so only the "YYYY-MM-DDTHH:MM:SS" prefix is fixed
+    # width. Compare on that as strings and parse only the newest stamp.
+    newest = max((f["upload_time_iso_8601"]
+                  for files in meta["releases"].values() for f in files),
+                 key=lambda stamp: stamp[:19], default=None)
+    latest = parse_iso8601(newest) if newest else datetime(1970, 1, 1, tzinfo=timezone.utc)
+    dl30 = stats.get("data", {}).get("last_month", 0)
+    return PKG(name, info.get("summary", "")[:60], latest, dl30, "")
 
 
 def pypi_meta(name: str) -> PKG | None:
+    if pkg := _memoized(name):
+        return pkg
+    try:
+        meta = _loads(cached_get(JSON_URL.format(name=name), timeout=15))
+        stats = _loads(cached_get(STATS_URL.format(name=name), timeout=15))
+        return _memoize(name, _build_pkg(name, meta, stats))
+    except Exception:
+        return None
+
+
+async def _get_json(session, url: str):
+    return _loads(await cached_get_async(session, url))
+
+
+async def pypi_meta_async(session, sem: asyncio.Semaphore, name: str) -> PKG | None:
+    if pkg := _memoized(name):
+        return pkg
     try:
-        meta = requests.get(JSON_URL.format(name=name), timeout=15).json()
-        info = meta["info"]
-        dates = [isoparse(f["upload_time_iso_8601"])
-                 for files in meta["releases"].values() for f in files]
-        latest = max(dates) if dates else datetime(1970, 1, 1, tzinfo=timezone.utc)
-        stats = requests.get(STATS_URL.format(name=name), timeout=15).json()
-        dl30 = stats.get("data", {}).get("last_month", 0)
-        return PKG(name, info.get("summary", "")[:60], latest, dl30, "")
+        async with sem:
+            meta, stats = await asyncio.gather(
+                _get_json(session, JSON_URL.format(name=name)),
+                _get_json(session, STATS_URL.format(name=name)))
+        return _memoize(name, _build_pkg(name, meta, stats))
     except Exception:
         return None
 
+
+async def gather_meta(names: list[str], limit: int) -> list[PKG | None]:
+    """Fetch JSON + stats for every name over one pooled aiohttp session."""
+    connector = aiohttp.TCPConnector(limit=64, limit_per_host=32, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=30)
+    sem = asyncio.Semaphore(limit)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={"User-Agent": USER_AGENT}) as session:
+        return await asyncio.gather(*(pypi_meta_async(session, sem, n) for n in names))
+
 # --------------------------------------------------------------------- #
 # conda-forge helpers                                                   #
 # --------------------------------------------------------------------- #
-def _download_conda_names() -> set[str]:
+if _MSGSPEC:
+    class _PkgMeta(msgspec.Struct):
+        name: str
+
+    class _Repodata(msgspec.Struct):
+        packages: dict[str, _PkgMeta] = {}
+
+
+def _stream_repodata_names(fp) -> set[str]:
+    """Collect packages.*.name from a repodata stream with ijson events, so
+    the document is never materialised."""
     names: set[str] = set()
-    for sub in CONDA_SUBDIRS:
-        try:
-            data = requests.get(CONDA_TMPL.format(subdir=sub), timeout=40).json()
-            pkgs = data.get("packages", {})
-            names.update(meta["name"] for meta in pkgs.values())
-        except Exception:
-            continue
+    depth, top, key = 0, None, None
+    for _, event, value in ijson.parse(fp):
+        if event in ("start_map", "start_array"):
+            depth += 1
+        elif event in ("end_map", "end_array"):
+            depth -= 1
+        elif event == "map_key":
+            if depth == 1:
+                top = value
+            elif depth == 3:
+                key = value
+        elif depth == 3 and key == "name" and top == "packages":
+            names.add(value)
     return names
 
 
-def load_conda_names() -> set[str]:
+def _repodata_names(path: pathlib.Path) -> set[str]:
+    if _IJSON:
+        with open(path, "rb") as fh:
+            return _stream_repodata_names(fh)
+    body = path.read_bytes()
+    if _MSGSPEC:
+        # Typed decode: only "packages" -> {"name"} is materialised
+        return {m.name for m in msgspec.json.decode(body, type=_Repodata).packages.values()}
+    return {meta["name"] for meta in _loads(body).get("packages", {}).values()}
+
+
+def _subdir_names(sub: str) -> set[str]:
+    return _repodata_names(cached_download(CONDA_TMPL.format(subdir=sub), timeout=40))
+
+
+def _download_conda_names() -> frozenset[str]:
+    # Subdirs are independent downloads; fetch them side by side
+    names: set[str] = set()
+    with ThreadPoolExecutor(max_workers=len(CONDA_SUBDIRS)) as executor:
+        for fut in as_completed([executor.submit(_subdir_names, sub)
+                                 for sub in CONDA_SUBDIRS]):
+            try:
+                names.update(fut.result())
+            except Exception:
+                continue
+    return frozenset(names)
+
+
+def load_conda_names() -> frozenset[str]:
     if CONDA_CACHE.exists() and time.time() - CONDA_CACHE.stat().st_mtime < CONDA_STALE:
         try:
-            return set(json.loads(CONDA_CACHE.read_text()))
+            return frozenset(_loads(CONDA_CACHE.read_bytes()))
         except Exception:
             pass
     names = _download_conda_names()
     try:
-        CONDA_CACHE.write_text(json.dumps(sorted(names)))
+        CONDA_CACHE.write_bytes(_dumps(sorted(names)))
     except Exception:
         pass
     return names
 
 
-def map_to_conda(pip_name: str, conda_names: set[str]) -> str:
+# (canonical pip name, conda name set) -> best conda name or ""
+_CONDA_MEMO: dict[tuple[str, frozenset[str]], str] = {}
+
+
+def map_to_conda(pip_names: list[str], conda_names: frozenset[str]) -> list[str]:
+    """Return the most plausible conda-forge name for each pip name (empty
+    string if none). Names without an exact or memoised match are
+    fuzzy-scored against all conda names in a single, multi-threaded
+    rapidfuzz cdist call."""
     canon = lambda s: s.lower().replace("_", "-")
-    pip_c = canon(pip_name)
-    if pip_c in conda_names:
-        return pip_c
-    match = process.extractOne(pip_c, conda_names, scorer=fuzz.QRatio)
-    return match[0] if match and match[1] >= 80 else ""
+    pip_c = [canon(n) for n in pip_names]
+    # frozenset caches its hash, so keying on the set itself is cheap
+    todo = sorted({c for c in pip_c
+                   if c not in conda_names and (c, conda_names) not in _CONDA_MEMO})
+    if todo and conda_names:
+        choices = list(conda_names)
+        scores = process.cdist(todo, choices, scorer=fuzz.QRatio,
+                               score_cutoff=80, dtype=np.uint8, workers=-1)
+        best = scores.argmax(axis=1)
+        for row, c in enumerate(todo):
+            ok = scores[row, best[row]] >= 80
+            _CONDA_MEMO[c, conda_names] = choices[best[row]] if ok else ""
+    return [c if c in conda_names else _CONDA_MEMO.get((c, conda_names), "")
+            for c in pip_c]
 
 # --------------------------------------------------------------------- #
 # CSV / PDF writers                                                     #
@@ -149,9 +521,9 @@ def write_csv(path: str, records: list[PKG]) -> None:
         w = csv.writer(fh)
         w.writerow(["rank", "package", "conda_name",
                     "released_utc", "downloads_30d", "summary"])
-        for r, p in enumerate(records, 1):
-            w.writerow([r, p.name, p.conda,
-                        p.released.strftime("%Y-%m-%d"), p.downloads, p.summary])
+        w.writerows((r, p.name, p.conda, p.released_day,
+                     p.downloads, p.summary)
+                    for r, p in enumerate(records, 1))
 
 
 def write_pdf(path: str, query: str, criterion: str, records: list[PKG]) -> None:
@@ -177,16 +549,30 @@ def write_pdf(path: str, query: str, criterion: str, records: list[PKG]) -> None
         cvs.drawString(x, y, h)
     y -= lh
     cvs.line(margin, y+2, PAGE_W-margin, y+2)
-    for r, p in enumerate(records, 1):
-        if r > max_rows:
-            break
-        cvs.drawString(col[0], y, str(r))
-        cvs.drawString(col[1], y, p.name)
-        cvs.drawString(col[2], y, p.conda or "—")
-        cvs.drawString(col[3], y, p.released.strftime("%Y-%m-%d"))
-        cvs.drawRightString(col[4]+0.6*inch, y, f"{p.downloads:,}")
-        cvs.drawString(col[5], y, p.summary[:80])
-        y -= lh
+    # One text object per column instead of a drawString (a separate BT/ET
+    # block) per cell
+    shown = records[:max_rows]
+    cells = ([str(r) for r in range(1, len(shown) + 1)],
+             [p.name for p in shown],
+             [p.conda or "—" for p in shown],
+             [p.released_day for p in shown],
+             None,
+             [p.summary[:80] for p in shown])
+    for x, column in zip(col, cells):
+        if column is None:
+            continue
+        txt = cvs.beginText(x, y)
+        txt.setLeading(lh)
+        for cell in column:
+            txt.textLine(cell)
+        cvs.drawText(txt)
+    # downloads are right-aligned, so each line gets its own origin
+    right = col[4] + 0.6*inch
+    txt = cvs.beginText()
+    for i, p in enumerate(shown):
+        txt.setTextOrigin(right - cvs.stringWidth(p.downloads_fmt), y - i*lh)
+        txt.textOut(p.downloads_fmt)
+    cvs.drawText(txt)
     cvs.save()
 
 # --------------------------------------------------------------------- #
@@ -200,8 +586,11 @@ def main() -> None:
                     help="sorting criterion for results")
     ag.add_argument("--limit", type=int, default=20,
                     help="maximum number of packages to display")
-    ag.add_argument("--threads", type=int, default=16,
-                    help="number of parallel threads for metadata fetch")
+    ag.add_argument("--scorer", choices=tuple(SCORERS), default="qratio",
+                    help="fuzzy scorer: Levenshtein-based qratio or FZF-style "
+                         "subsequence matching (subseq)")
+    ag.add_argument("--threads", type=int, default=32,
+                    help="number of packages fetched concurrently")
     ag.add_argument("--with-conda", action="store_true",
                     help="map to conda-forge names for micromamba")
     ag.add_argument("--csv", metavar="FILE",
@@ -212,25 +601,37 @@ def main() -> None:
                     help="prompt to install selected packages via pip")
     args = ag.parse_args()
 
+    # The conda-forge names depend on nothing PyPI returns, so they load in
+    # the background while the index and per-package metadata are fetched
+    background = ThreadPoolExecutor(max_workers=1)
+    conda_future = background.submit(load_conda_names) if args.with_conda else None
+
     console.status("[green bold]Fetching PyPI index…")
-    all_pkgs = fetch_pypi_index()
-    candidates = best_pypi_matches(args.query, all_pkgs, k=600)
+    all_pkgs, processed = fetch_pypi_index()
+    candidates = best_pypi_matches(args.query, all_pkgs, processed, k=600,
+                                   scorer=SCORERS[args.scorer])
 
     console.status("[green bold]Downloading per-package metadata…")
-    from concurrent.futures import ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=args.threads) as executor:
-        rows = list(filter(None, executor.map(pypi_meta, candidates)))
+    if _AIOHTTP:
+        rows = list(filter(None, asyncio.run(gather_meta(candidates, args.threads))))
+    else:
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            rows = list(filter(None, executor.map(pypi_meta, candidates)))
 
     # Optional conda mapping
-    if args.with_conda:
+    if conda_future:
         console.status("[green bold]Loading conda-forge names…")
-        conda_names = load_conda_names()
-        rows = [p._replace(conda=map_to_conda(p.name, conda_names)) for p in rows]
+        conda_names = conda_future.result()
+        mapped = map_to_conda([p.name for p in rows], conda_names)
+        for p, c in zip(rows, mapped):
+            p.conda = c
+    background.shutdown()
 
     # Sort and trim
     rows.sort(key=(lambda p: p.released) if args.sort == "latest"
               else (lambda p: p.downloads), reverse=True)
     rows = rows[: args.limit]
+    format_rows(rows)
 
     if not rows:
         console.print("[red]No matches.[/red]")
@@ -250,7 +651,7 @@ def main() -> None:
         cells = [str(idx), f"[bold]{pkg.name}[/]"]
         if args.with_conda:
             cells.append(pkg.conda or "—")
-        cells.extend([pkg.released.strftime("%Y-%m-%d"), f"{pkg.downloads:,}", pkg.summary])
+        cells.extend([pkg.released_day, pkg.downloads_fmt, pkg.summary])
         table.add_row(*cells)
     console.print(table)
 
@@ -274,7 +675,13 @@ def main() -> None:
             to_install = [rows[i-1].name for i in chosen]
             if to_install:
                 console.print(f"Installing: {', '.join(to_install)}")
-                subprocess.run([sys.executable, "-m", "pip", "install", *to_install], check=True)
+                if shutil.which("uv"):
+                    # uv resolves and downloads in parallel; --python keeps the
+                    # target the interpreter running this script, like pip
+                    cmd = ["uv", "pip", "install", "--python", sys.executable]
+                else:
+                    cmd = [sys.executable, "-m", "pip", "install"]
+                subprocess.run([*cmd, *to_install], check=True)
             else:
                 console.print("[yellow]No packages selected. Nothing to install.[/]")
         except Exception as ex:
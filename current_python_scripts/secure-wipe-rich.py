@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 import os
 import re
+import errno
+import mmap
+import ctypes
+import struct
+import stat
+import platform
 import argparse
-import subprocess
 import sys
 from ast import literal_eval, parse, Expression
 from rich.progress import Progress, BarColumn, TransferSpeedColumn, TimeElapsedColumn, TimeRemainingColumn, TextColumn
@@ -52,26 +57,374 @@ def get_size(path: str) -> int:
         return os.path.getsize(path)
 
 
-def wipe_one(path: str, source: str, bs: int, passes: int):
+def open_target(path: str):
+    """
+    Open path for overwriting in place. O_DIRECT keeps the wipe out of the
+    page cache; filesystems that refuse it (e.g. tmpfs) get a plain open.
+    Returns (fd, direct).
+    """
+    try:
+        return os.open(path, os.O_WRONLY | os.O_DIRECT), True
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        return os.open(path, os.O_WRONLY), False
+
+
+def fill_random(src_fd: int, view: memoryview):
+    """Fill view completely from src_fd (large reads may come back short)."""
+    got = 0
+    while got < len(view):
+        got += os.readv(src_fd, [view[got:]])
+
+
+def write_pass(path: str, src_fd, view: memoryview, size: int, progress, task):
+    """
+    Overwrite the first size bytes of path with the buffer, refilling it from
+    src_fd before every block (None = zeros, so the buffer is written as is).
+    """
+    fd, direct = open_target(path)
+    try:
+        done = 0
+        while done < size:
+            chunk = view[:min(len(view), size - done)]
+            if src_fd is not None:
+                fill_random(src_fd, chunk)
+            try:
+                n = os.write(fd, chunk)
+            except OSError as e:
+                if not direct or e.errno != errno.EINVAL:
+                    raise
+                # Block size or file tail not aligned for O_DIRECT:
+                # finish this pass through the page cache instead. Open the
+                # new descriptor first so a failure leaves fd valid to close.
+                new_fd = os.open(path, os.O_WRONLY)
+                os.close(fd)
+                fd, direct = new_fd, False
+                os.lseek(fd, done, os.SEEK_SET)
+                continue
+            done += n
+            progress.update(task, advance=n)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# ---------------------------------------------------------------------------
+# io_uring backend: raw io_uring_setup/io_uring_enter through ctypes, so no
+# binding is needed. Plain stores into the shared rings are only ordered
+# strongly enough on x86-64, hence the platform check.
+# ---------------------------------------------------------------------------
+SYS_io_uring_setup = 425
+SYS_io_uring_enter = 426
+SYS_io_uring_register = 427
+IORING_REGISTER_PROBE = 8
+IO_URING_OP_SUPPORTED = 1 << 0
+IORING_OFF_SQ_RING = 0
+IORING_OFF_CQ_RING = 0x8000000
+IORING_OFF_SQES = 0x10000000
+IORING_ENTER_GETEVENTS = 1 << 0
+IORING_ENTER_SQ_WAKEUP = 1 << 1
+IORING_SETUP_IOPOLL = 1 << 0
+IORING_SETUP_SQPOLL = 1 << 1
+IORING_SETUP_SQ_AFF = 1 << 2
+IORING_SQ_NEED_WAKEUP = 1 << 0
+IORING_OP_WRITE = 23
+
+QUEUE_DEPTH = 32            # writes kept in flight
+URING_BUFFERS_MAX = 64 << 20  # cap on QUEUE_DEPTH * bs
+IO_IOPOLL_BATCH = 8         # completions polled for per io_uring_enter
+
+_SQE = struct.Struct("<BBHiQQIIQ24x")   # struct io_uring_sqe, 64 bytes
+_CQE = struct.Struct("<QiI")            # struct io_uring_cqe, 16 bytes
+_U32 = struct.Struct("<I")
+_PROBE = struct.Struct("<BBH12x")       # struct io_uring_probe header, 16 bytes
+_PROBE_OP = struct.Struct("<BBH4x")     # struct io_uring_probe_op, 8 bytes
+PROBE_OPS = 256
+
+
+class IoUringParams(ctypes.Structure):
+    # sq_off / cq_off are struct io_{sq,cq}ring_offsets as ten u32 each
+    _fields_ = [("sq_entries", ctypes.c_uint32), ("cq_entries", ctypes.c_uint32),
+                ("flags", ctypes.c_uint32), ("sq_thread_cpu", ctypes.c_uint32),
+                ("sq_thread_idle", ctypes.c_uint32), ("features", ctypes.c_uint32),
+                ("wq_fd", ctypes.c_uint32), ("resv", ctypes.c_uint32 * 3),
+                ("sq_off", ctypes.c_uint32 * 10), ("cq_off", ctypes.c_uint32 * 10)]
+
+
+class IoUring:
+    """Just enough of io_uring to queue writes, submit them and reap completions."""
+
+    def __init__(self, entries: int, flags: int = 0, sq_thread_cpu: int = 0):
+        if platform.machine() != 'x86_64':
+            raise OSError(errno.ENOSYS, "io_uring backend is x86-64 only")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._libc.syscall.restype = ctypes.c_long
+        params = IoUringParams(flags=flags, sq_thread_cpu=sq_thread_cpu)
+        self._sqpoll = bool(flags & IORING_SETUP_SQPOLL)
+        self.iopoll = bool(flags & IORING_SETUP_IOPOLL)
+        self.fd = self._syscall(SYS_io_uring_setup, ctypes.c_long(entries), ctypes.byref(params))
+        if not self._supports(IORING_OP_WRITE):
+            # Before 5.6 there is neither a probe nor IORING_OP_WRITE, and
+            # every write would complete with -EINVAL
+            os.close(self.fd)
+            raise OSError(errno.EOPNOTSUPP, "kernel lacks IORING_OP_WRITE")
+        sq, cq = params.sq_off, params.cq_off
+        self.entries = params.sq_entries
+        self._sq_ring = mmap.mmap(self.fd, sq[6] + params.sq_entries * 4,
+                                  offset=IORING_OFF_SQ_RING)
+        self._cq_ring = mmap.mmap(self.fd, cq[5] + params.cq_entries * _CQE.size,
+                                  offset=IORING_OFF_CQ_RING)
+        self._sqes = mmap.mmap(self.fd, params.sq_entries * _SQE.size, offset=IORING_OFF_SQES)
+        self._sq_head, self._sq_tail, self._sq_array = sq[0], sq[1], sq[6]
+        self._sq_flags = sq[4]
+        self._sq_mask = _U32.unpack_from(self._sq_ring, sq[2])[0]
+        self._cq_head, self._cq_tail, self._cqes = cq[0], cq[1], cq[5]
+        self._cq_mask = _U32.unpack_from(self._cq_ring, cq[2])[0]
+        self._tail = _U32.unpack_from(self._sq_ring, self._sq_tail)[0]
+        self._to_submit = 0
+
+    def _syscall(self, *args) -> int:
+        while True:
+            ret = self._libc.syscall(*args)
+            if ret >= 0:
+                return ret
+            err = ctypes.get_errno()
+            if err != errno.EINTR:
+                raise OSError(err, os.strerror(err))
+
+    def _supports(self, opcode: int) -> bool:
+        """Ask the kernel (IORING_REGISTER_PROBE) whether it implements opcode."""
+        probe = ctypes.create_string_buffer(_PROBE.size + PROBE_OPS * _PROBE_OP.size)
+        try:
+            self._syscall(SYS_io_uring_register, ctypes.c_long(self.fd),
+                          ctypes.c_long(IORING_REGISTER_PROBE), probe, ctypes.c_long(PROBE_OPS))
+        except OSError:
+            return False
+        last_op = _PROBE.unpack_from(probe)[0]
+        if opcode > last_op:
+            return False
+        flags = _PROBE_OP.unpack_from(probe, _PROBE.size + opcode * _PROBE_OP.size)[2]
+        return bool(flags & IO_URING_OP_SUPPORTED)
+
+    def prep_write(self, fd: int, addr: int, length: int, offset: int, user_data: int):
+        head = _U32.unpack_from(self._sq_ring, self._sq_head)[0]
+        if (self._tail - head) & 0xffffffff >= self.entries:
+            raise RuntimeError("io_uring submission queue full")
+        idx = self._tail & self._sq_mask
+        _SQE.pack_into(self._sqes, idx * _SQE.size, IORING_OP_WRITE, 0, 0, fd,
+                       offset, addr, length, 0, user_data)
+        _U32.pack_into(self._sq_ring, self._sq_array + idx * 4, idx)
+        self._tail = (self._tail + 1) & 0xffffffff
+        _U32.pack_into(self._sq_ring, self._sq_tail, self._tail)
+        self._to_submit += 1
+
+    def ready(self) -> int:
+        """Number of completions waiting in the CQ ring."""
+        head = _U32.unpack_from(self._cq_ring, self._cq_head)[0]
+        return (_U32.unpack_from(self._cq_ring, self._cq_tail)[0] - head) & 0xffffffff
+
+    def submit(self, wait_nr: int = 0):
+        """Submit queued SQEs with one io_uring_enter, waiting for wait_nr completions."""
+        flags = IORING_ENTER_GETEVENTS if wait_nr else 0
+        if self._sqpoll:
+            # The kernel thread picks SQEs up by itself, so enter only to wake
+            # it or to sleep until completions arrive. Waiting always sends
+            # SQ_WAKEUP too: Python cannot fence between the tail store and
+            # the NEED_WAKEUP load, and a missed wakeup would never complete.
+            self._to_submit = 0
+            asleep = _U32.unpack_from(self._sq_ring, self._sq_flags)[0] & IORING_SQ_NEED_WAKEUP
+            if not asleep and self.ready() >= wait_nr:
+                return
+            flags |= IORING_ENTER_SQ_WAKEUP
+            self._syscall(SYS_io_uring_enter, ctypes.c_long(self.fd), ctypes.c_long(0),
+                          ctypes.c_long(wait_nr), ctypes.c_long(flags), None, ctypes.c_long(0))
+            return
+        ret = self._syscall(SYS_io_uring_enter, ctypes.c_long(self.fd),
+                            ctypes.c_long(self._to_submit), ctypes.c_long(wait_nr),
+                            ctypes.c_long(flags), None, ctypes.c_long(0))
+        self._to_submit -= ret
+
+    def reap(self) -> list:
+        """Return [(user_data, res), ...] for every available completion."""
+        head = _U32.unpack_from(self._cq_ring, self._cq_head)[0]
+        tail = _U32.unpack_from(self._cq_ring, self._cq_tail)[0]
+        done = []
+        while head != tail:
+            user_data, res, _ = _CQE.unpack_from(
+                self._cq_ring, self._cqes + (head & self._cq_mask) * _CQE.size)
+            done.append((user_data, res))
+            head = (head + 1) & 0xffffffff
+        _U32.pack_into(self._cq_ring, self._cq_head, head)
+        return done
+
+    def close(self):
+        for m in (self._sqes, self._cq_ring, self._sq_ring):
+            m.close()
+        os.close(self.fd)
+
+
+def write_pass_uring(path: str, ring: IoUring, src_fd, bs: int, size: int, progress, task):
+    """
+    write_pass() on io_uring: up to ring.entries blocks are in flight at once,
+    each io_uring_enter submits every free block and waits for about half of
+    them, so the device queue stays full and syscalls are paid per batch.
+    A polled ring only completes writes while we sit in io_uring_enter, so it
+    waits for IO_IOPOLL_BATCH at a time instead.
+    Returns False, having written nothing, if the target refuses O_DIRECT.
+    """
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_DIRECT)
+    except OSError as e:
+        if e.errno != errno.EINVAL:
+            raise
+        return False
+    depth = ring.entries
+    batch = IO_IOPOLL_BATCH if ring.iopoll else max(1, depth // 2)
+    bufs = mmap.mmap(-1, depth * bs)
+    anchor = ctypes.c_char.from_buffer(bufs)
+    base = ctypes.addressof(anchor)
+    view = memoryview(bufs)
+    buffered_fd = None
+    inflight = {}   # buffer index -> (file offset, length, buffer offset)
+    free = list(range(depth))
+    retry = []      # remainders of short writes
+    next_off = done = 0
+    try:
+        while done < size:
+            while retry:
+                ring.prep_write(*retry.pop())
+            while free and next_off < size:
+                i = free.pop()
+                n, boff = min(bs, size - next_off), i * bs
+                if src_fd is not None:
+                    fill_random(src_fd, view[boff:boff + n])
+                ring.prep_write(fd, base + boff, n, next_off, i)
+                inflight[i] = (next_off, n, boff)
+                next_off += n
+            ring.submit(min(len(inflight), batch))
+            for i, res in ring.reap():
+                off, n, boff = inflight[i]
+                if res == -errno.EINVAL:
+                    # O_DIRECT refused this block (unaligned file tail):
+                    # write it through the page cache instead
+                    if buffered_fd is None:
+                        buffered_fd = os.open(path, os.O_WRONLY)
+                    res = os.pwrite(buffered_fd, view[boff:boff + n], off)
+                elif res < 0:
+                    raise OSError(-res, os.strerror(-res), path)
+                if res == 0:
+                    raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC), path)
+                done += res
+                progress.update(task, advance=res)
+                if res < n:
+                    inflight[i] = (off + res, n - res, boff + res)
+                    retry.append((fd, base + boff + res, n - res, off + res, i))
+                else:
+                    del inflight[i]
+                    free.append(i)
+        os.fsync(fd)
+        if buffered_fd is not None:
+            os.fsync(buffered_fd)
+        return True
+    finally:
+        os.close(fd)
+        if buffered_fd is not None:
+            os.close(buffered_fd)
+        del anchor
+        view.release()
+        bufs.close()
+
+
+def iopoll_capable(path: str) -> bool:
+    """True if path is a block device whose queue has polling enabled (NVMe poll_queues)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISBLK(st.st_mode):
+        return False
+    dev = f"/sys/dev/block/{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"
+    # A partition has no queue/ of its own; it shares the whole disk's
+    for queue in (f"{dev}/queue/io_poll", f"{dev}/../queue/io_poll"):
+        try:
+            with open(queue) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return False
+
+
+def open_ring(bs: int, sqpoll: bool = False, iopoll: bool = False):
+    """
+    Return an IoUring sized for bs-byte blocks, or None (with a note) if unusable.
+
+    sqpoll hands submission to a kernel thread pinned to the last CPU we may
+    run on, so a steady stream of writes needs no io_uring_enter to submit.
+    That thread spins for a second after going idle, which only pays off on
+    long, sustained wipes.
+
+    iopoll reaps completions by polling the device instead of taking an
+    interrupt per write. If the kernel refuses a polled ring, a normal one is
+    returned without comment.
+    """
+    if bs % mmap.PAGESIZE:
+        console.print(f"[yellow]NOTE[/] io_uring needs a block size that is a multiple "
+                      f"of {mmap.PAGESIZE}; using plain writes.")
+        return None
+    try:
+        flags, cpu = 0, 0
+        if sqpoll:
+            flags = IORING_SETUP_SQPOLL
+            cpus = sorted(os.sched_getaffinity(0))
+            if len(cpus) > 1:
+                flags |= IORING_SETUP_SQ_AFF
+                cpu = cpus[-1]
+        entries = max(1, min(QUEUE_DEPTH, URING_BUFFERS_MAX // bs))
+        if iopoll:
+            try:
+                return IoUring(entries, flags | IORING_SETUP_IOPOLL, cpu)
+            except OSError:
+                pass
+        return IoUring(entries, flags, cpu)
+    except OSError as e:
+        console.print(f"[yellow]NOTE[/] io_uring unavailable ({e.strerror}); using plain writes.")
+        return None
+
+
+def wipe_one(path: str, source: str, bs: int, passes: int, use_uring: bool = False,
+             sqpoll: bool = False, iopoll: bool = False):
     size = get_size(path)
-    for p in range(1, passes+1):
-        desc = f"Wiping {os.path.basename(path)} pass {p}/{passes}"
-        cmd = ["dd", f"if={source}", f"of={path}", f"bs={bs}", "status=progress"]
-        proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True)
-        progress = Progress(
-            TextColumn("[bold blue]" + desc), BarColumn(), TransferSpeedColumn(),
-            TimeElapsedColumn(), TimeRemainingColumn(), console=console, transient=True
-        )
-        task = progress.add_task("", total=size)
-        with progress:
-            for line in proc.stderr:
-                m = re.match(r"^(\d+)", line)
-                if m:
-                    progress.update(task, completed=int(m.group(1)))
-            proc.wait()
-        if proc.returncode != 0:
-            console.print(f"[red]ERROR[/] pass {p} failed (code {proc.returncode})")
-            break
+    ring = None
+    if use_uring or sqpoll or iopoll:
+        ring = open_ring(bs, sqpoll, iopoll and iopoll_capable(path))
+    # An anonymous mmap is page-aligned, as O_DIRECT requires, and starts zeroed
+    buf = mmap.mmap(-1, bs)
+    view = memoryview(buf)
+    src_fd = None if source == '/dev/zero' else os.open(source, os.O_RDONLY)
+    try:
+        for p in range(1, passes+1):
+            desc = f"Wiping {os.path.basename(path)} pass {p}/{passes}"
+            progress = Progress(
+                TextColumn("[bold blue]" + desc), BarColumn(), TransferSpeedColumn(),
+                TimeElapsedColumn(), TimeRemainingColumn(), console=console, transient=True
+            )
+            task = progress.add_task("", total=size)
+            try:
+                with progress:
+                    if ring is None or not write_pass_uring(path, ring, src_fd, bs, size,
+                                                            progress, task):
+                        write_pass(path, src_fd, view, size, progress, task)
+            except OSError as e:
+                console.print(f"[red]ERROR[/] pass {p} failed ({e.strerror})")
+                break
+    finally:
+        if ring is not None:
+            ring.close()
+        if src_fd is not None:
+            os.close(src_fd)
+        view.release()
+        buf.close()
 
 
 def main_wipe():
@@ -83,6 +436,14 @@ def main_wipe():
                         help='Number of overwrite passes, arithmetic OK')
     parser.add_argument('-b','--bs', type=parse_size, default=parse_size('1M'),
                         help='Block size (arithmetic & suffix OK)')
+    parser.add_argument('--io-uring', action='store_true',
+                        help='Queue the writes through io_uring (O_DIRECT, batched submission)')
+    parser.add_argument('--sqpoll', action='store_true',
+                        help='io_uring with a kernel submission thread (implies --io-uring); '
+                             'for long wipes only, it idles on a CPU for 1 s')
+    parser.add_argument('--iopoll', action='store_true',
+                        help='io_uring with polled completions (implies --io-uring); '
+                             'used only on block devices with poll queues, e.g. NVMe')
     parser.add_argument('targets', nargs='+', help='Devices or files to erase')
     args = parser.parse_args()
 
@@ -94,7 +455,8 @@ def main_wipe():
         if not os.path.exists(tgt):
             console.print(f"[red]ERROR[/] {tgt} not found.")
             continue
-        wipe_one(tgt, source, args.bs, args.passes)
+        wipe_one(tgt, source, args.bs, args.passes, use_uring=args.io_uring,
+                 sqpoll=args.sqpoll, iopoll=args.iopoll)
     console.print("[green]Secure wipe completed.[/]")
 
 if __name__ == '__main__':
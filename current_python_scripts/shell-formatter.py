@@ -19,13 +19,17 @@ Example:
     format_sh.py ~/.zsh_profile/zsh_plugins.zsh formatted_plugins.zsh
 """
 import argparse
+import io
 import re
 import sys
-import textwrap
-import shutil
 from pathlib import Path
 from datetime import datetime
 
+# Compiled once; runs on every line of the input
+_COMMENT_RE = re.compile(r'(?<!\\)#')
+# Words and the runs of spaces between them, for _greedy_wrap
+_CHUNK_RE = re.compile(r' +|[^ ]+')
+
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Wrap and align shell scripts to a standard style"
@@ -45,7 +49,7 @@ def parse_args():
     return parser.parse_args()
 
 def split_comment(line):
-    match = re.search(r'(?<!\\)#', line)
+    match = _COMMENT_RE.search(line)
     if not match:
         return line.rstrip(), ''
     idx = match.start()
@@ -53,36 +57,53 @@ def split_comment(line):
     comment_text = line[idx+1:].lstrip()
     return code, comment_text
 
+def _greedy_wrap(text, width, initial_indent='', subsequent_indent=''):
+    """
+    Fill lines greedily up to width, breaking only at spaces. Equivalent to
+    textwrap.wrap(..., break_long_words=False, break_on_hyphens=False) but
+    without building a TextWrapper for every line.
+    """
+    chunks = _CHUNK_RE.findall(text.expandtabs())
+    chunks.reverse()
+    lines = []
+    while chunks:
+        indent = subsequent_indent if lines else initial_indent
+        avail = width - len(indent)
+        # Spaces at a break are dropped (but not before the very first line)
+        if lines and chunks[-1][0] == ' ':
+            chunks.pop()
+        cur = []
+        cur_len = 0
+        while chunks and cur_len + len(chunks[-1]) <= avail:
+            cur_len += len(chunks[-1])
+            cur.append(chunks.pop())
+        if chunks and not cur and len(chunks[-1]) > avail:
+            # Overlong word: it gets a line to itself rather than being split
+            cur.append(chunks.pop())
+        if cur and cur[-1][0] == ' ':
+            cur.pop()
+        if cur:
+            lines.append(indent + ''.join(cur))
+    return lines
+
 def wrap_code(code, width, indent_str):
     if len(code) <= width:
         return [code]
     subsequent_indent = indent_str + '    '
-    wrapped = textwrap.wrap(
-        code,
-        width=width,
-        initial_indent=indent_str,
-        subsequent_indent=subsequent_indent,
-        break_long_words=False,
-        break_on_hyphens=False
-    )
+    wrapped = _greedy_wrap(code, width, indent_str, subsequent_indent)
     return [line + ' \\' for line in wrapped[:-1]] + [wrapped[-1]]
 
 def wrap_comment(text, width, indent_str):
     max_comment_width = width - len(indent_str) - 2
-    lines = textwrap.wrap(
-        text,
-        width=max_comment_width,
-        break_long_words=False,
-        break_on_hyphens=False
-    )
+    lines = _greedy_wrap(text, max_comment_width)
     return [f"{indent_str}# {line}" for line in lines]
 
-def process_file(path, width):
-    output = []
-    for raw in path.read_text().splitlines():
+def process_file(text, width):
+    """Format the script source in text; returns the formatted source."""
+    buf = io.StringIO()
+    for raw in text.splitlines():
         code, comment = split_comment(raw)
-        indent_match = re.match(r'(\s*)', code)
-        indent_str = indent_match.group(1) if indent_match else ''
+        indent_str = code[:len(code) - len(code.lstrip())]
         code_lines = wrap_code(code, width, indent_str) if code else ['']
         if comment:
             inline = f"{code_lines[-1]}  # {comment}".rstrip()
@@ -92,19 +113,23 @@ def process_file(path, width):
                 fragments = wrap_comment(comment, width, indent_str)
                 code_lines[-1] = f"{code_lines[-1]}  {fragments[0].lstrip()}"
                 for frag in fragments[1:]:
-                    output.append(frag)
-        output.extend(code_lines)
-    return output
+                    buf.write(frag)
+                    buf.write('\n')
+        for line in code_lines:
+            buf.write(line)
+            buf.write('\n')
+    return buf.getvalue()
 
 def main():
     args = parse_args()
-    formatted = process_file(args.input_file, args.width)
+    text = process_file(args.input_file.read_bytes().decode('utf-8'), args.width)
 
     # Determine destination
     dest = args.output_file or args.input_file
 
     # If in-place, backup under ~/.logs/scripts/YYYY-MM-DD/HH-MM-SS
     if args.output_file is None:
+        import shutil
         now = datetime.now()
         date_str = now.strftime('%Y-%m-%d')
         time_str = now.strftime('%H-%M-%S')
@@ -117,8 +142,7 @@ def main():
     else:
         print(f"[INFO] Writing formatted script to: {dest}")
 
-    text = "\n".join(formatted) + "\n"
-    Path(dest).write_text(text)
+    Path(dest).write_bytes(text.encode('utf-8'))
 
 if __name__ == '__main__':
     main()
@@ -17,105 +17,115 @@ Usage:
 
 Requirements:
     - Python 3.6+
+    - NumPy
     - pacman (in your PATH)
 """
 
-import re
 import subprocess
 import sys
+import tempfile
+from typing import List
 
-def get_pacman_info() -> str:
+import numpy as np
+
+# Multipliers from pacman's size units to KiB
+_UNIT_KIB = {"KiB": 1, "MiB": 1024, "GiB": 1024 * 1024}
+
+def iter_packages():
     """
-    Run `pacman -Qi` and return its full stdout as text.
+    Run `pacman -Qi` and yield (name, size_kib) for each package as soon as
+    its block (terminated by a blank line) has been read, instead of
+    buffering and splitting the whole output.
     Exits on error.
     """
-    try:
-        proc = subprocess.run(
-            ["pacman", "-Qi"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-    except subprocess.CalledProcessError as e:
-        print(f"Error: failed to run pacman -Qi:\n{e.stderr}", file=sys.stderr)
-        sys.exit(1)
-    return proc.stdout
-
-def parse_info_block(block: str):
+    # stderr goes to a file: an unread pipe would fill up and stall pacman
+    errfile = tempfile.TemporaryFile(mode="w+")
+    proc = subprocess.Popen(
+        ["pacman", "-Qi"],
+        stdout=subprocess.PIPE,
+        stderr=errfile,
+        text=True,
+        bufsize=1
+    )
+    with errfile, proc:
+        block = []
+        for line in proc.stdout:
+            if line.strip():
+                block.append(line)
+                continue
+            if block:
+                yield parse_info_block(block)
+                block = []
+        if block:
+            yield parse_info_block(block)
+
+        if proc.wait() != 0:
+            errfile.seek(0)
+            print(f"Error: failed to run pacman -Qi:\n{errfile.read()}", file=sys.stderr)
+            sys.exit(1)
+
+def parse_info_block(lines):
     """
-    Given a block of text for one package (lines separated by '\n'),
-    extract the package name and installed size.
+    Given the lines of one package's info block, extract the package name
+    and installed size.
     Returns:
         (name: str, size_kib: float) or (None, None) if parsing fails.
     """
     name = None
     size_kib = None
 
-    # Regex to match "Installed Size :  1 234,56 MiB" (comma or dot decimal)
-    size_re = re.compile(r"Installed Size\s*:\s*([\d\.,]+)\s*(KiB|MiB|GiB)")
-
-    for line in block.splitlines():
+    for line in lines:
         if line.startswith("Name"):
             # e.g. "Name           : bash"
-            parts = line.split(":", 1)
-            name = parts[1].strip() if len(parts) == 2 else None
+            _, sep, value = line.partition(":")
+            name = value.strip() if sep else None
 
         elif line.startswith("Installed Size"):
-            m = size_re.search(line)
-            if m:
-                num_str, unit = m.groups()
-                # Normalize decimal comma → dot
-                num = float(num_str.replace(",", "."))
-                # Convert to KiB
-                if unit == "KiB":
-                    size_kib = num
-                elif unit == "MiB":
-                    size_kib = num * 1024
-                elif unit == "GiB":
-                    size_kib = num * 1024 * 1024
+            # e.g. "Installed Size : 1,56 MiB" (comma or dot decimal)
+            parts = line.partition(":")[2].split()
+            if len(parts) == 2 and parts[1] in _UNIT_KIB:
+                try:
+                    size_kib = float(parts[0].replace(",", ".")) * _UNIT_KIB[parts[1]]
+                except ValueError:
+                    pass
 
     return name, size_kib
 
-def human_readable(kib: float) -> str:
+_DISPLAY_UNITS = np.array(["KiB", "MiB", "GiB"])
+
+def human_readable(kib: np.ndarray) -> List[str]:
     """
-    Convert a size in KiB back to a human-friendly string with 2 decimals.
+    Convert an array of sizes in KiB back to human-friendly strings with 2 decimals.
     """
-    if kib < 1024:
-        return f"{kib:.2f} KiB"
-    elif kib < 1024 * 1024:
-        return f"{(kib / 1024):.2f} MiB"
-    else:
-        return f"{(kib / (1024 * 1024)):.2f} GiB"
+    # Unit index is floor(log2(kib) / 10), clamped to KiB..GiB
+    idx = np.clip(np.log2(np.maximum(kib, 1)) // 10, 0, 2).astype(np.intp)
+    scaled = kib / np.power(1024.0, idx)
+    return [f"{v:.2f} {u}" for v, u in zip(scaled.tolist(), _DISPLAY_UNITS[idx])]
 
 def main():
-    # 1) Get raw pacman output
-    data = get_pacman_info()
-
-    # 2) Split into blocks (each package is separated by a blank line)
-    blocks = data.strip().split("\n\n")
-
-    # 3) Parse each block, collect (name, size_kib)
-    pkg_list = []
-    for block in blocks:
-        name, size_kib = parse_info_block(block)
+    # 1) Stream pacman output, collecting names and sizes (KiB) per package
+    names = []
+    sizes = []
+    for name, size_kib in iter_packages():
         if name:
+            names.append(name)
             # Treat missing size as 0 so it sorts at the end
-            pkg_list.append((name, size_kib if size_kib is not None else 0.0))
+            sizes.append(size_kib if size_kib is not None else 0.0)
+    sizes = np.array(sizes, dtype=np.float64)
 
-    # 4) Sort descending by size_kib
-    pkg_list.sort(key=lambda x: x[1], reverse=True)
+    # 2) Sort descending by size (stable, so ties keep pacman's order)
+    order = np.argsort(-sizes, kind="stable")
 
-    # 5) Print table
+    # 3) Print table
     header_pkg = "Package"
     header_size = "Installed Size"
     print(f"{header_pkg:<30} {header_size:>15}")
     print("-" * 46)
 
-    for name, size_kib in pkg_list:
+    human = human_readable(sizes)
+    for i in order:
         # If original size was missing, mark as "N/A"
-        human = human_readable(size_kib) if size_kib > 0 else "N/A"
-        print(f"{name:<30} {human:>15}")
+        print(f"{names[i]:<30} {human[i] if sizes[i] > 0 else 'N/A':>15}")
 
 if __name__ == "__main__":
     main()
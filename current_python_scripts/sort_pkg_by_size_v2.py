@@ -15,64 +15,129 @@ Usage:
 """
 
 import argparse
+import ctypes
+import heapq
+import json
+import operator
+import os
+import pathlib
 import re
 import subprocess
 import sys
-from typing import List, Tuple
+import tempfile
+from typing import Iterator, List, Optional, Tuple
 
 from rich.console import Console
 from rich.table import Table
 
 # ──────────────────────────────────────────────────────────────────────────────
 
-_SIZE_RE = re.compile(r"Installed Size\s*:\s*([\d\.,]+)\s*(KiB|MiB|GiB)")
+# One match per pacman -Qi block: (name, size number, unit). Units other than
+# KiB/MiB/GiB (pacman prints "0.00 B" for empty packages) count as 0 KiB.
+_PKG_RE = re.compile(
+    rb"^Name\s*:\s*(\S+).*?^Installed Size\s*:\s*([\d.,]+)\s*(\S+)", re.M | re.S
+)
+_UNIT_KIB = {b"KiB": 1, b"MiB": 1024, b"GiB": 1024 * 1024}
+READ_CHUNK = 1 << 16  # bytes per read of pacman's stdout
+_SIZE = operator.itemgetter(1)  # sort key of a (name, size_kib) row
 
-def get_pacman_info() -> str:
+# Parsed results are reused until the local package DB changes; pacman
+# touches this directory on every install, upgrade and removal.
+PACMAN_DB = "/var/lib/pacman/local"
+CACHE_FILE = pathlib.Path.home() / ".cache" / "sort_pkg_by_size" / "pkgs.json"
+
+class _AlpmList(ctypes.Structure):
+    """alpm_list_t: libalpm's doubly linked list node."""
+
+_AlpmList._fields_ = [
+    ("data", ctypes.c_void_p),
+    ("prev", ctypes.POINTER(_AlpmList)),
+    ("next", ctypes.POINTER(_AlpmList)),
+]
+
+
+def query_libalpm() -> Optional[List[Tuple[str, float]]]:
     """
-    Run `pacman -Qi` and return its stdout. Exit on error.
+    Read (name, size_kib) for every installed package straight from libalpm,
+    the library pacman itself uses, with no subprocess or text to parse.
+
+    Returns None if libalpm cannot be loaded or refuses to open the DB.
     """
     try:
-        proc = subprocess.run(
-            ["pacman", "-Qi"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True,
-        )
-        return proc.stdout
-    except subprocess.CalledProcessError as e:
-        print(f"Error: failed to run `pacman -Qi`:\n{e.stderr}", file=sys.stderr)
+        alpm = ctypes.CDLL("libalpm.so")
+    except OSError:
+        return None
+    alpm.alpm_initialize.restype = ctypes.c_void_p
+    alpm.alpm_initialize.argtypes = [ctypes.c_char_p, ctypes.c_char_p,
+                                     ctypes.POINTER(ctypes.c_int)]
+    alpm.alpm_release.argtypes = [ctypes.c_void_p]
+    alpm.alpm_get_localdb.restype = ctypes.c_void_p
+    alpm.alpm_get_localdb.argtypes = [ctypes.c_void_p]
+    alpm.alpm_db_get_pkgcache.restype = ctypes.POINTER(_AlpmList)
+    alpm.alpm_db_get_pkgcache.argtypes = [ctypes.c_void_p]
+    alpm.alpm_pkg_get_name.restype = ctypes.c_char_p
+    alpm.alpm_pkg_get_name.argtypes = [ctypes.c_void_p]
+    alpm.alpm_pkg_get_isize.restype = ctypes.c_int64  # off_t
+    alpm.alpm_pkg_get_isize.argtypes = [ctypes.c_void_p]
+
+    err = ctypes.c_int()
+    dbpath = os.path.dirname(PACMAN_DB).encode()
+    handle = alpm.alpm_initialize(b"/", dbpath, ctypes.byref(err))
+    if not handle:
+        return None
+    try:
+        pkgs = []
+        node = alpm.alpm_db_get_pkgcache(alpm.alpm_get_localdb(handle))
+        while node:
+            pkg = node.contents.data
+            pkgs.append((alpm.alpm_pkg_get_name(pkg).decode("ascii"),
+                         alpm.alpm_pkg_get_isize(pkg) / 1024))
+            node = node.contents.next
+        return pkgs or None
+    finally:
+        alpm.alpm_release(handle)
+
+def get_pacman_info() -> Iterator[Tuple[str, float]]:
+    """
+    Yield (name, size_kib) per package from libalpm, or else from `pacman -Qi`
+    output while it streams in. Exit on error.
+    """
+    pkgs = query_libalpm()
+    if pkgs is not None:
+        yield from pkgs
+        return
+    # stderr goes to a file: an unread pipe would fill up and stall pacman
+    errfile = tempfile.TemporaryFile()
+    proc = subprocess.Popen(
+        ["pacman", "-Qi"],
+        stdout=subprocess.PIPE,
+        stderr=errfile,
+        bufsize=0,
+    )
+    buf = b""
+    with errfile, proc:
+        while chunk := proc.stdout.read(READ_CHUNK):
+            buf += chunk
+            # Only blocks ended by a blank line are complete; keep the rest
+            cut = buf.rfind(b"\n\n")
+            if cut != -1:
+                for n, s, u in _PKG_RE.findall(buf, 0, cut):
+                    yield n.decode("ascii"), _to_kib(s, u)
+                buf = buf[cut:]
+        for n, s, u in _PKG_RE.findall(buf):
+            yield n.decode("ascii"), _to_kib(s, u)
+        proc.wait()
+        errfile.seek(0)
+        stderr = errfile.read()
+    if proc.returncode != 0:
+        print(f"Error: failed to run `pacman -Qi`:\n{stderr.decode(errors='replace')}", file=sys.stderr)
         sys.exit(1)
 
-def parse_info_block(block: str) -> Tuple[str, float]:
+def _to_kib(num_str: bytes, unit: bytes) -> float:
     """
-    From one `pacman -Qi` block, extract:
-      – name (str)
-      – size in KiB (float)
-
-    Falls back to "<unknown>" or 0.0 if parsing fails.
+    Convert an `Installed Size` number and unit to KiB (0.0 for unknown units).
     """
-    name = "<unknown>"
-    size_kib = 0.0
-
-    for line in block.splitlines():
-        if line.startswith("Name"):
-            _, val = line.split(":", 1)
-            name = val.strip() or name
-
-        elif line.startswith("Installed Size"):
-            m = _SIZE_RE.search(line)
-            if m:
-                num_str, unit = m.groups()
-                num = float(num_str.replace(",", "."))
-                if unit == "KiB":
-                    size_kib = num
-                elif unit == "MiB":
-                    size_kib = num * 1024
-                elif unit == "GiB":
-                    size_kib = num * 1024 * 1024
-
-    return name, size_kib
+    return float(num_str.replace(b",", b".")) * _UNIT_KIB.get(unit, 0)
 
 def human_readable(kib: float) -> str:
     """
@@ -86,16 +151,48 @@ def human_readable(kib: float) -> str:
     else:
         return f"{(mib/1024):.2f} GiB"
 
+def load_packages() -> List[Tuple[str, float]]:
+    """
+    Return every installed package as (name, size_kib), unsorted.
+
+    The list is cached in CACHE_FILE together with the st_mtime_ns of
+    PACMAN_DB, so `pacman -Qi` only runs again after the DB has changed.
+    """
+    try:
+        mtime_ns = os.stat(PACMAN_DB).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if mtime_ns is not None:
+        try:
+            with open(CACHE_FILE, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["mtime_ns"] == mtime_ns:
+                return [(name, kib) for name, kib in cached["pkgs"]]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # missing or unreadable cache: rebuild it
+
+    pkgs = list(get_pacman_info())
+
+    if mtime_ns is not None:
+        tmp = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
+        try:
+            CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"mtime_ns": mtime_ns, "pkgs": pkgs}, f)
+            os.rename(tmp, CACHE_FILE)
+        except OSError:
+            pass  # caching is best effort
+    return pkgs
+
 def build_package_list(limit: int = None) -> List[Tuple[str, float]]:
     """
     Return a list of (name, size_kib), sorted descending by size.
     If `limit` is given, truncate to the top-N packages.
     """
-    raw = get_pacman_info()
-    blocks = raw.strip().split("\n\n")
-    pkgs = [parse_info_block(b) for b in blocks]
-    pkgs.sort(key=lambda x: x[1], reverse=True)
-    return pkgs if limit is None else pkgs[:limit]
+    pkgs = load_packages()
+    if limit is None:
+        return sorted(pkgs, key=_SIZE, reverse=True)
+    return heapq.nlargest(limit, pkgs, key=_SIZE)
 
 def print_table(rows: List[Tuple[str, float]], console: Console) -> None:
     """
@@ -37,11 +37,69 @@ import os
 import re
 import subprocess
 import sys
-from ast import literal_eval, parse
-from rich.progress import Progress, BarColumn, TransferSpeedColumn, TimeElapsedColumn, TimeRemainingColumn, TextColumn
-from rich.console import Console
-
-console = Console()
+import time
+
+_TOKEN_RE = re.compile(r"\s*(?:(\d+)|(\S))")
+# dd's status=progress updates lead with the byte count; matched on raw bytes
+_PROGRESS_RE = re.compile(rb"(\d+) bytes")
+# Redraw at most every UPDATE_INTERVAL seconds unless ~1% more was written
+UPDATE_INTERVAL = 0.1
+
+def _eval_arith(expr: str) -> int:
+    """
+    Evaluate an integer expression of + - * / and parentheses with a small
+    recursive-descent parser (no ast/compile). Division must be exact.
+    """
+    tokens = [int(num) if num else op for num, op in _TOKEN_RE.findall(expr)]
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take():
+        nonlocal pos
+        if pos >= len(tokens):
+            raise ValueError("unexpected end of expression")
+        pos += 1
+        return tokens[pos - 1]
+
+    def expression():
+        value = term()
+        while peek() in ('+', '-'):
+            op, rhs = take(), term()
+            value = value + rhs if op == '+' else value - rhs
+        return value
+
+    def term():
+        value = factor()
+        while peek() in ('*', '/'):
+            op, rhs = take(), factor()
+            if op == '*':
+                value *= rhs
+            elif rhs == 0 or value % rhs:
+                raise ValueError("non-integer division")
+            else:
+                value //= rhs
+        return value
+
+    def factor():
+        tok = take()
+        if tok == '(':
+            value = expression()
+            if take() != ')':
+                raise ValueError("missing ')'")
+            return value
+        if tok in ('+', '-'):
+            value = factor()
+            return value if tok == '+' else -value
+        if isinstance(tok, int):
+            return tok
+        raise ValueError(f"unexpected token {tok!r}")
+
+    value = expression()
+    if pos != len(tokens):
+        raise ValueError(f"unexpected token {tokens[pos]!r}")
+    return value
 
 def parse_numeric(expr: str) -> int:
     """Evaluate arithmetic expressions with optional M/G suffix."""
@@ -50,8 +108,7 @@ def parse_numeric(expr: str) -> int:
         raise argparse.ArgumentTypeError(f"Invalid expression '{expr}'")
     body, suff = m.group(1), m.group(2)
     try:
-        node = parse(body, mode='eval')
-        value = literal_eval(node)
+        value = _eval_arith(body)
     except Exception:
         raise argparse.ArgumentTypeError(f"Cannot evaluate '{body}'")
     if not isinstance(value, int) or value < 1:
@@ -64,41 +121,50 @@ def parse_numeric(expr: str) -> int:
 
 def get_size(path: str) -> int:
     """Return total size of block device or file in bytes."""
+    # Seeking to the end reports the size of both regular files and block
+    # devices, so no BLKGETSIZE64 ioctl is needed.
     try:
-        import fcntl, struct
-        BLKGETSIZE64 = 0x80081272
-        with open(path, 'rb') as f:
-            buf = fcntl.ioctl(f, BLKGETSIZE64, b' ' * 8)
-            return struct.unpack('Q', buf)[0]
-    except Exception:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
         return os.path.getsize(path)
+    try:
+        return os.lseek(fd, 0, os.SEEK_END)
+    except OSError:
+        return os.path.getsize(path)
+    finally:
+        os.close(fd)
 
 
-def wipe_target(path: str, source: str, bs: int, passes: int):
-    """Perform the secure wipe for a single path."""
+def wipe_target(path: str, source: str, bs: int, passes: int, progress):
+    """Perform the secure wipe for a single path on the shared progress display."""
+    console = progress.console
     total = get_size(path)
     for p in range(1, passes + 1):
         desc = f"Pass {p}/{passes} on {os.path.basename(path)}"
         cmd = ["dd", f"if={source}", f"of={path}", f"bs={bs}", "status=progress"]
         console.log(f"[blue]Starting {desc} (cmd: {' '.join(cmd)})")
-        proc = subprocess.Popen(cmd, stderr=subprocess.PIPE, text=True)
-
-        progress = Progress(
-            TextColumn("[bold blue]" + desc),
-            BarColumn(bar_width=None),
-            TransferSpeedColumn(),
-            TimeElapsedColumn(),
-            TimeRemainingColumn(),
-            console=console,
-            transient=True
-        )
-        task = progress.add_task("", total=total)
-        with progress:
-            for line in proc.stderr:
-                m = re.match(r"^(\d+)", line)
-                if m:
-                    progress.update(task, completed=int(m.group(1)))
-            proc.wait()
+        task = progress.add_task(desc, total=total)
+        proc = subprocess.Popen(cmd, stderr=subprocess.PIPE)
+        done = last_bytes = 0
+        last_ts = time.monotonic()
+        # dd ends each update with \r rather than \n, so read whatever is
+        # available, scan the complete updates and carry the unterminated tail
+        tail = b""
+        while chunk := proc.stderr.read1(65536):
+            buf = tail + chunk
+            cut = max(buf.rfind(b"\n"), buf.rfind(b"\r")) + 1
+            buf, tail = buf[:cut], buf[cut:]
+            m = None
+            for m in _PROGRESS_RE.finditer(buf):
+                pass
+            if m:
+                done = int(m.group(1))
+                now = time.monotonic()
+                if now - last_ts > UPDATE_INTERVAL or done - last_bytes > total / 100:
+                    progress.update(task, completed=done)
+                    last_ts, last_bytes = now, done
+        proc.wait()
+        progress.remove_task(task)
         if proc.returncode != 0:
             console.print(f"[red]ERROR[/] {desc} failed (code {proc.returncode})")
             break
@@ -121,16 +187,33 @@ def main():
     parser.add_argument('-h','--help', action='help', help='Show help and exit')
     args = parser.parse_args()
 
+    # Rich is imported only once we know there is real work (not for --help
+    # or argument errors)
+    from rich.console import Console
+    from rich.progress import Progress, BarColumn, TransferSpeedColumn, TimeElapsedColumn, TimeRemainingColumn, TextColumn
+    console = Console()
+
     if os.geteuid() != 0:
         console.print("[red]ERROR[/] Root privileges required.")
         sys.exit(1)
     source = '/dev/urandom' if args.random else '/dev/zero'
 
-    for tgt in args.TARGET:
-        if not os.path.exists(tgt):
-            console.print(f"[red]ERROR[/] Target not found: {tgt}")
-            continue
-        wipe_target(tgt, source, args.bs, args.passes)
+    # One live display for every target and pass; each pass is its own task
+    progress = Progress(
+        TextColumn("[bold blue]{task.description}"),
+        BarColumn(bar_width=None),
+        TransferSpeedColumn(),
+        TimeElapsedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+        transient=True
+    )
+    with progress:
+        for tgt in args.TARGET:
+            if not os.path.exists(tgt):
+                console.print(f"[red]ERROR[/] Target not found: {tgt}")
+                continue
+            wipe_target(tgt, source, args.bs, args.passes, progress)
 
     console.print("[green]Secure wipe completed successfully.[/]")
 
@@ -12,8 +12,20 @@ making it easy to feed into other commands, such as:
     ssh-add -t $(python mytimer.py "3 hours 59 minutes 1 second") ~/.ssh/id_rsa
 """
 
+import re
 import sys
 
+# Recognized units and their conversion to seconds (plural "s" is optional)
+TIME_UNITS_SECONDS = {"second": 1.0, "minute": 60.0, "hour": 3600.0}
+
+# A specification made only of plain "<number> <unit>" pairs is parsed by the
+# regex engine in one pass; anything else (exponents, typos, missing units)
+# falls through to the token loop below, which also produces the errors.
+_SPEC_RE = re.compile(r"(?:\s*\d+(?:\.\d*)?\s+(?:second|minute|hour)s?(?!\S))+\s*",
+                      re.IGNORECASE | re.ASCII)
+_PAIR_RE = re.compile(r"(\d+(?:\.\d*)?)\s+(second|minute|hour)",
+                      re.IGNORECASE | re.ASCII)
+
 def parse_time_input(time_str):
     """
     Parse a time specification string (e.g., '4 hours', '240 minutes',
@@ -33,19 +45,13 @@ def parse_time_input(time_str):
     # Remove commas to simplify tokenization (e.g., "3 hours, 59 minutes")
     time_str_cleaned = time_str.replace(",", "")
 
+    if _SPEC_RE.fullmatch(time_str_cleaned):
+        return sum(float(quantity) * TIME_UNITS_SECONDS[unit.lower()]
+                   for quantity, unit in _PAIR_RE.findall(time_str_cleaned))
+
     # Split on whitespace to get tokens
     tokens = time_str_cleaned.split()
 
-    # Dictionary for recognized units and their corresponding conversion to seconds
-    time_units_seconds = {
-        "second": 1.0,
-        "seconds": 1.0,
-        "minute": 60.0,
-        "minutes": 60.0,
-        "hour": 3600.0,
-        "hours": 3600.0
-    }
-
     total_seconds = 0.0
 
     # We expect tokens in pairs: number + unit 
@@ -64,10 +70,11 @@ def parse_time_input(time_str):
         unit = tokens[i].lower()
         i += 1  # advance to next token
 
-        if unit not in time_units_seconds:
+        base_unit = unit[:-1] if unit.endswith("s") else unit
+        if base_unit not in TIME_UNITS_SECONDS:
             raise ValueError(f"Unrecognized time unit: {unit}")
 
-        total_seconds += quantity * time_units_seconds[unit]
+        total_seconds += quantity * TIME_UNITS_SECONDS[base_unit]
 
     return total_seconds
 
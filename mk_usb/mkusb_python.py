@@ -3,15 +3,45 @@ import os
 import subprocess
 import sys
 
-def run_command(command):
-    """Run a shell command and return its output."""
+def run_command(argv, input=None):
+    """Run a command (argv list, no shell) and return its output.
+
+    input, if given, is fed to the command's stdin as bytes."""
     try:
-        output = subprocess.check_output(command, shell=True, stderr=subprocess.STDOUT)
+        output = subprocess.check_output(argv, input=input, stderr=subprocess.STDOUT)
         return output.decode()
     except subprocess.CalledProcessError as e:
-        print("Error executing command:", e.cmd)
+        print("Error executing command:", " ".join(e.cmd))
         return e.output.decode()
 
+SENDFILE_CHUNK = 64 << 20  # bytes per sendfile() call
+
+def copy_tree(src_dir, dst_dir):
+    """Copy the regular files under src_dir into dst_dir in-kernel.
+
+    Each source is hinted POSIX_FADV_SEQUENTIAL (larger readahead for a
+    strictly linear read) and moved with sendfile(), so no data passes through
+    user space. Symlinks are skipped; the FAT32 target cannot store them."""
+    for root, dirs, files in os.walk(src_dir):
+        target = os.path.join(dst_dir, os.path.relpath(root, src_dir))
+        os.makedirs(target, exist_ok=True)
+        for name in files:
+            src = os.path.join(root, name)
+            if os.path.islink(src):
+                continue
+            src_fd = os.open(src, os.O_RDONLY)
+            try:
+                os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                dst_fd = os.open(os.path.join(target, name),
+                                 os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    while os.sendfile(dst_fd, src_fd, None, SENDFILE_CHUNK):
+                        pass
+                finally:
+                    os.close(dst_fd)
+            finally:
+                os.close(src_fd)
+
 def check_and_install_package(package_name):
     """Check if a Python package is installed and offer to install it if not."""
     try:
@@ -22,7 +52,7 @@ def check_and_install_package(package_name):
         user_input = input(f"Do you want to install {package_name}? (y/n): ").strip().lower()
         if user_input == 'y':
             print("Installing package...")
-            install_command = f"sudo pacman -S {package_name} --noconfirm"
+            install_command = ["sudo", "pacman", "-S", package_name, "--noconfirm"]
             print(run_command(install_command))
         else:
             print("The package is required to run this script.")
@@ -41,7 +71,7 @@ def choose_iso():
 
 def choose_usb_device():
     """Let the user choose a USB device interactively."""
-    devices = subprocess.check_output("lsblk -dno NAME,SIZE,MODEL", shell=True).decode().splitlines()
+    devices = subprocess.check_output(["lsblk", "-dno", "NAME,SIZE,MODEL"]).decode().splitlines()
     device_completer = WordCompleter(devices, ignore_case=True)
     usb_device = prompt("Enter the USB device path (e.g., /dev/sdx): ", completer=device_completer)
     if not usb_device.startswith("/dev/"):
@@ -57,48 +87,61 @@ def create_bootable_usb():
 
     # Partition the USB drive
     print("Partitioning the USB drive...")
-    partition_command = f"echo -e 'o\\nn\\np\\n1\\n\\n+{partition1_size}M\\nn\\np\\n2\\n\\n+{partition2_size}M\\nw' | sudo fdisk {usb_device}"
-    print(run_command(partition_command))
+    fdisk_script = f"o\nn\np\n1\n\n+{partition1_size}M\nn\np\n2\n\n+{partition2_size}M\nw\n"
+    print(run_command(["sudo", "fdisk", usb_device], input=fdisk_script.encode()))
 
     # Format the first partition as FAT32
     print("Formatting the first partition as FAT32...")
-    format_command_1 = f"sudo mkfs.fat -F 32 {usb_device}1"
+    format_command_1 = ["sudo", "mkfs.fat", "-F", "32", f"{usb_device}1"]
     print(run_command(format_command_1))
 
     # Format the second partition as ext4 (or another filesystem if needed)
     print("Formatting the second partition as ext4...")
-    format_command_2 = f"sudo mkfs.ext4 {usb_device}2"
+    format_command_2 = ["sudo", "mkfs.ext4", f"{usb_device}2"]
     print(run_command(format_command_2))
 
     # Mount the first partition and ISO
     print("Mounting the first partition...")
-    mount_usb_command = f"sudo mount {usb_device}1 /mnt/usb"
+    mount_usb_command = ["sudo", "mount", f"{usb_device}1", "/mnt/usb"]
     print(run_command(mount_usb_command))
     print("Mounting the ISO file...")
-    mount_iso_command = f"sudo mount -o loop {iso_path} /mnt/iso"
+    mount_iso_command = ["sudo", "mount", "-o", "loop", iso_path, "/mnt/iso"]
     print(run_command(mount_iso_command))
 
-    # Copy files from the ISO to the USB
-    print("Copying files from the ISO to the USB...")
-    copy_files_command = "sudo cp -r /mnt/iso/* /mnt/usb/"
-    print(run_command(copy_files_command))
-
-    # Install GRUB bootloader
-    print("Installing GRUB bootloader...")
-    install_grub_command = f"sudo grub-install --target=i386-pc --boot-directory=/mnt/usb/boot {usb_device}"
-    print(run_command(install_grub_command))
-
-    # Generate GRUB configuration file
-    print("Generating GRUB configuration file...")
-    grub_cfg_command = "sudo grub-mkconfig -o /mnt/usb/boot/grub/grub.cfg"
-    print(run_command(grub_cfg_command))
-
-    # Unmount the ISO and USB
-    print("Unmounting ISO and USB...")
-    unmount_iso_command = "sudo umount /mnt/iso"
-    unmount_usb_command = "sudo umount /mnt/usb"
-    print(run_command(unmount_iso_command))
-    print(run_command(unmount_usb_command))
+    try:
+        # Copy files from the ISO to the USB
+        print("Copying files from the ISO to the USB...")
+        if os.geteuid() == 0:
+            # Already root, so the mounted partition is writable from here
+            try:
+                copy_tree("/mnt/iso", "/mnt/usb")
+            except OSError as e:
+                print("Error copying files:", e)
+                return
+        else:
+            # rsync with --whole-file skips the delta algorithm and streams each file
+            # in large blocks; -r rather than -a because FAT32 can hold neither owners
+            # nor permissions. The trailing "/" copies the ISO's contents.
+            copy_files_command = ["sudo", "rsync", "-r", "--whole-file", "/mnt/iso/", "/mnt/usb/"]
+            print(run_command(copy_files_command))
+
+        # Install GRUB bootloader
+        print("Installing GRUB bootloader...")
+        install_grub_command = ["sudo", "grub-install", "--target=i386-pc",
+                                "--boot-directory=/mnt/usb/boot", usb_device]
+        print(run_command(install_grub_command))
+
+        # Generate GRUB configuration file
+        print("Generating GRUB configuration file...")
+        grub_cfg_command = ["sudo", "grub-mkconfig", "-o", "/mnt/usb/boot/grub/grub.cfg"]
+        print(run_command(grub_cfg_command))
+    finally:
+        # Unmount the ISO and USB, even if a step above failed
+        print("Unmounting ISO and USB...")
+        unmount_iso_command = ["sudo", "umount", "/mnt/iso"]
+        unmount_usb_command = ["sudo", "umount", "/mnt/usb"]
+        print(run_command(unmount_iso_command))
+        print(run_command(unmount_usb_command))
 
     print("Bootable USB creation process complete!")
 
@@ -9,12 +9,31 @@ mount_dir = "/mnt/windows_iso"
 usb_fat32_mount_dir = "/mnt/usb_fat32"
 usb_ntfs_mount_dir = "/mnt/usb_ntfs"
 
-def run_command(command):
-    process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+def start_command(command):
+    return subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+def wait_command(process, command):
     stdout, stderr = process.communicate()
     if process.returncode != 0:
         raise Exception(f"Command failed: {command}\nError: {stderr.decode()}")
 
+def run_command(command):
+    wait_command(start_command(command), command)
+
+def run_parallel(*commands):
+    # Start every command first, then wait for all of them
+    processes = [start_command(command) for command in commands]
+    # Reap every process before reporting a failure, so nothing is left
+    # writing to the device while the caller cleans up
+    errors = []
+    for process, command in zip(processes, commands):
+        try:
+            wait_command(process, command)
+        except Exception as e:
+            errors.append(e)
+    if errors:
+        raise errors[0]
+
 def prepare_usb_drive(usb_dev):
     # Unmount any mounted partitions on the USB drive
     run_command(f"umount {usb_dev}* || true")
@@ -25,11 +44,12 @@ def prepare_usb_drive(usb_dev):
     # Create a small FAT32 partition for UEFI boot
     run_command(f"parted -a opt {usb_dev} mkpart primary fat32 1MiB 512MiB")
     run_command(f"parted {usb_dev} set 1 esp on")
-    run_command(f"mkfs.vfat -F 32 {usb_dev}1")
 
     # Create a larger NTFS partition for the Windows installation files
     run_command(f"parted -a opt {usb_dev} mkpart primary ntfs 512MiB 100%")
-    run_command(f"mkfs.ntfs -f {usb_dev}2")
+
+    # The partition table is final now, so format both partitions at once
+    run_parallel(f"mkfs.vfat -F 32 {usb_dev}1", f"mkfs.ntfs -f {usb_dev}2")
 
 def mount_iso(iso_path, mount_dir):
     os.makedirs(mount_dir, exist_ok=True)
@@ -42,14 +62,31 @@ def mount_usb_partitions(usb_dev, usb_fat32_mount_dir, usb_ntfs_mount_dir):
     os.makedirs(usb_ntfs_mount_dir, exist_ok=True)
     run_command(f"mount {usb_dev}2 {usb_ntfs_mount_dir}")
 
-def copy_files(src_dir, dst_dir):
-    run_command(f"rsync -avh --progress {src_dir}/ {dst_dir}")
+def start_copy_files(src_dir, dst_dir):
+    # stdout is captured and discarded, so skip -v/--progress output entirely
+    command = f"rsync -ah {src_dir}/ {dst_dir}"
+    return start_command(command), command
+
+def copy_file_range_copy(src, dst):
+    # Copy inside the kernel with copy_file_range(); kernels that refuse the
+    # cross-filesystem case (EXDEV etc.) fall back to an ordinary copy
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError:
+        shutil.copyfile(src, dst)
 
 def make_usb_bootable(usb_fat32_mount_dir):
     # Ensure the EFI directory exists and copy the bootx64.efi file
     efi_boot_dir = os.path.join(usb_fat32_mount_dir, "efi", "boot")
     os.makedirs(efi_boot_dir, exist_ok=True)
-    shutil.copy(os.path.join(mount_dir, "efi", "boot", "bootx64.efi"), efi_boot_dir)
+    copy_file_range_copy(os.path.join(mount_dir, "efi", "boot", "bootx64.efi"),
+                         os.path.join(efi_boot_dir, "bootx64.efi"))
 
 def cleanup(mount_dir, usb_fat32_mount_dir, usb_ntfs_mount_dir):
     run_command(f"umount {mount_dir}")
@@ -64,8 +101,19 @@ def create_bootable_usb(usb_dev, iso_path, mount_dir, usb_fat32_mount_dir, usb_n
         prepare_usb_drive(usb_dev)
         mount_iso(iso_path, mount_dir)
         mount_usb_partitions(usb_dev, usb_fat32_mount_dir, usb_ntfs_mount_dir)
-        copy_files(mount_dir, usb_ntfs_mount_dir)  # Copy Windows files to NTFS partition
-        make_usb_bootable(usb_fat32_mount_dir)
+        # Copy Windows files to NTFS partition in the background while the
+        # EFI loader goes onto the FAT32 partition
+        copy = start_copy_files(mount_dir, usb_ntfs_mount_dir)
+        try:
+            make_usb_bootable(usb_fat32_mount_dir)
+        except Exception:
+            # Still reap rsync, but report this error rather than rsync's
+            try:
+                wait_command(*copy)
+            except Exception:
+                pass
+            raise
+        wait_command(*copy)
         print("Bootable USB created successfully.")
     except Exception as e:
         print(f"An error occurred: {e}")